@@ -1,29 +1,71 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.database import engine, Base
-from app.routes import auth, interns, tasks, dashboard, users, analytics, notifications
-from app.models import User, Intern, Task, Notification
+from config.database import SessionLocal, engine, read_engine, settings
+from app.routes import auth, interns, tasks, dashboard, users, analytics, notifications, system, batch, reports, changes
+from app.utils.password_hashing import password_hasher
+from app.utils.avatars import ImmutableStaticFiles, shutdown_thumbnail_pool
+from app.utils.reports import shutdown_report_pool
+from app.utils.intern_mirror import intern_mirror
+from app.utils.db_routing import ReadYourWritesMiddleware
+from app.utils.profiling import ProfilingMiddleware
+from app.utils.compression import CompressionMiddleware
+from app.utils.body_limit import BodySizeLimitMiddleware
+from app.utils.admission import AdmissionControlMiddleware, configure_threadpool, route_class
+from app.utils.metrics import MetricsMiddleware, instrument_engine, publish_pool_sizes, render_metrics
+from app.utils.query_budget import install_query_budgets
+from app.utils.change_log import install_change_log
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+instrument_engine(engine, "primary")
+install_query_budgets(engine)
+if read_engine is not engine:
+    instrument_engine(read_engine, "replica")
+    install_query_budgets(read_engine)
+install_change_log(SessionLocal)
 
-# Create admin user on startup
-try:
-    from create_admin import create_admin_user
-    create_admin_user()
-except Exception as e:
-    print(f"Admin creation skipped: {e}")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker after gunicorn forks it. Schema and admin setup
+    # belong to bootstrap.py, which runs once per deploy.
+    if settings.auto_bootstrap:
+        from bootstrap import bootstrap
+        bootstrap()
+    os.makedirs(settings.upload_dir, exist_ok=True)
+    configure_threadpool()
+    publish_pool_sizes()
+    if settings.intern_mirror_enabled:
+        intern_mirror.start()
+    yield
+    intern_mirror.stop()
+    password_hasher.shutdown()
+    shutdown_thumbnail_pool()
+    shutdown_report_pool()
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
 
 app = FastAPI(
     title="Intern Management System API",
     description="Backend API for managing interns and their tasks",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Per-route-class concurrency limits; innermost, so shed 503s still get CORS
+# headers and only the handler's own work holds a slot
+if settings.admission_control_enabled:
+    app.add_middleware(AdmissionControlMiddleware)
+
+# 413 for oversized uploads before they are parsed or take an admission slot
+app.add_middleware(BodySizeLimitMiddleware)
+
 # CORS - Allow specific origins for production
 allowed_origins = [
     "https://intern-management-system-330cb.web.app",
@@ -37,8 +79,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Profile-Id"],
 )
 
+# gzip/brotli for JSON and other text payloads
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# Keeps a client's reads on the primary right after its own writes
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Opt-in sampling profiler (admins via X-Profile, or PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so latency covers the whole stack
+app.add_middleware(MetricsMiddleware)
+
 # Routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(interns.router, prefix="/api")
@@ -47,17 +103,43 @@ app.include_router(dashboard.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api")
 app.include_router(notifications.router, prefix="/api/notifications")
+app.include_router(system.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(reports.router, prefix="/api")
+app.include_router(changes.router, prefix="/api")
+
+# Uploaded avatars (content-addressed, served with long-lived caching)
+app.mount("/uploads", ImmutableStaticFiles(directory=settings.upload_dir, check_dir=False), name="uploads")
 
 @app.get("/")
+@route_class("light")
 def root():
     return {"message": "Intern Management System API"}
 
 @app.get("/health")
+@route_class("light")
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/ready")
+@route_class("light")
+def readiness_check():
+    # Unlike /health, fails while the database can't be reached
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": "unreachable"})
+    return {"status": "ready", "database": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+@route_class("light")
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 if __name__ == "__main__":
     import os
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port)
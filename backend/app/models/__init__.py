@@ -2,6 +2,11 @@
 from .user import User
 from .intern import Intern
 from .task import Task
-from .notification import Notification
+from .notification import Notification, NotificationArchive, NotificationInbox, NotificationReceipt
+from .report import ReportJob
+from .archive import InternArchive, TaskArchive
+from .change_log import ChangeLog
 
-__all__ = ["User", "Intern", "Task", "Notification"]
\ No newline at end of file
+__all__ = ["User", "Intern", "Task", "Notification", "NotificationArchive",
+           "NotificationInbox", "NotificationReceipt", "ReportJob",
+           "InternArchive", "TaskArchive", "ChangeLog"]
\ No newline at end of file
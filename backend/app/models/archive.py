@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Text
+from config.database import Base
+from datetime import datetime
+from .intern import InternStatus
+from .task import TaskStatus
+
+# Cold copies of interns and tasks moved out by archive_interns.py. Rows keep
+# their original ids (and column names), so they can be read through a UNION
+# with the hot tables and restored unchanged.
+
+class InternArchive(Base):
+    __tablename__ = "interns_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    full_name = Column(String(100), nullable=False)
+    email = Column(String(100), nullable=False, index=True)
+    phone = Column(String(20), nullable=False)
+    department = Column(String(50), nullable=False)
+    position = Column(String(100), nullable=True)
+    university = Column(String(100), nullable=True)
+    skills = Column(Text, nullable=True)
+    tech = Column(Text, nullable=True)
+    join_date = Column(DateTime, nullable=False)
+    status = Column(Enum(InternStatus), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class TaskArchive(Base):
+    __tablename__ = "tasks_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    intern_id = Column(Integer, nullable=False, index=True)  # an interns_archive row
+    title = Column(String(200), nullable=False)
+    description = Column(Text, nullable=True)
+    deadline = Column(DateTime, nullable=False)
+    status = Column(Enum(TaskStatus), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
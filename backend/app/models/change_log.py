@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from config.database import Base
+from datetime import datetime
+
+class ChangeLog(Base):
+    """One row per write to a synced entity; seq is the change feed cursor"""
+    __tablename__ = "change_log"
+    
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(20), nullable=False)  # 'intern', 'task', 'notification'
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)  # 'create', 'update', 'delete'
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
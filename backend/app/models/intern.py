@@ -10,6 +10,8 @@ class InternStatus(enum.Enum):
 
 class Intern(Base):
     __tablename__ = "interns"
+    # Never reuse an id: an archived intern keeps theirs in interns_archive
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     full_name = Column(String(100), nullable=False)
@@ -1,14 +1,55 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, ForeignKey
 from config.database import Base
 from datetime import datetime
 
 class Notification(Base):
     __tablename__ = "notifications"
+    # Ids only grow, even after retention empties the table: inbox read
+    # watermarks (last_read_id) compare against them
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     type = Column(String(20), nullable=False)  # 'intern_created', 'task_assigned', etc.
     title = Column(String(200), nullable=False)
     message = Column(Text, nullable=False)
-    is_read = Column(Boolean, default=False)
+    is_read = Column(Boolean, default=False)  # read by every user inbox
     created_at = Column(DateTime, default=datetime.utcnow)
-    priority = Column(String(10), default='medium')  # 'low', 'medium', 'high'
\ No newline at end of file
+    priority = Column(String(10), default='medium')  # 'low', 'medium', 'high'
+
+# Partial index over unread rows only: keeps the unread count an index-only
+# lookup and stays tiny no matter how much read history the table holds.
+Index(
+    "ix_notifications_unread",
+    Notification.created_at,
+    postgresql_where=Notification.is_read == False,
+    sqlite_where=Notification.is_read == False
+)
+
+class NotificationArchive(Base):
+    __tablename__ = "notifications_archive"
+    
+    id = Column(Integer, primary_key=True)
+    type = Column(String(20), nullable=False)
+    title = Column(String(200), nullable=False)
+    message = Column(Text, nullable=False)
+    is_read = Column(Boolean, default=True)
+    created_at = Column(DateTime)
+    priority = Column(String(10), default='medium')
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class NotificationInbox(Base):
+    """Per-user read state: a read watermark plus a maintained unread counter"""
+    __tablename__ = "notification_inboxes"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    last_read_id = Column(Integer, default=0, nullable=False)  # everything <= this is read
+    unread_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+class NotificationReceipt(Base):
+    """Individual reads above a user's watermark"""
+    __tablename__ = "notification_receipts"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"), primary_key=True)
+    read_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, ForeignKey, Index
+from config.database import Base
+from datetime import datetime
+import enum
+
+class ReportStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ReportJob(Base):
+    """A report computed off the web workers; the artifact lives in REPORT_DIR"""
+    __tablename__ = "report_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    kind = Column(String(30), nullable=False)  # 'analytics', 'departments'
+    params = Column(Text, nullable=False)  # canonical JSON
+    format = Column(String(10), nullable=False)  # 'json', 'csv'
+    definition_hash = Column(String(64), nullable=False, index=True)  # kind + params + format
+    data_version = Column(String(64), nullable=False)  # data the report was requested against
+    status = Column(Enum(ReportStatus), default=ReportStatus.PENDING, nullable=False)
+    artifact = Column(String(255), nullable=True)  # file name in REPORT_DIR
+    error = Column(Text, nullable=True)
+    requested_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+# At most one pending or running job per definition and data version, so
+# identical requests racing through enqueue_report share one job
+_active = ReportJob.status.in_([ReportStatus.PENDING, ReportStatus.RUNNING])
+Index(
+    "ux_report_jobs_active", ReportJob.definition_hash, ReportJob.data_version,
+    unique=True, sqlite_where=_active, postgresql_where=_active
+)
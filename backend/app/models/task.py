@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from config.database import Base
 from datetime import datetime
@@ -11,6 +11,8 @@ class TaskStatus(enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Never reuse an id: an archived task keeps its id in tasks_archive
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     intern_id = Column(Integer, ForeignKey("interns.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -22,4 +24,9 @@ class Task(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    intern = relationship("Intern", back_populates="tasks")
\ No newline at end of file
+    intern = relationship("Intern", back_populates="tasks")
+
+# Keyset pages of one intern's tasks (GET /tasks/intern/{id}?sort=, and
+# include=tasks on an intern) read straight off these, in sort order
+Index("ix_tasks_intern_deadline", Task.intern_id, Task.deadline, Task.id)
+Index("ix_tasks_intern_status", Task.intern_id, Task.status, Task.id)
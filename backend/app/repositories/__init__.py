@@ -0,0 +1 @@
+# Repositories package: queries shared by the routes that don't need ORM entities
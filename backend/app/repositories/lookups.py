@@ -0,0 +1,25 @@
+from typing import Optional
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+from app.models.intern import Intern
+from app.models.task import Task
+from app.models.user import User
+
+# Single-row lookups that run on nearly every request. Primary-key lookups
+# use Session.get: an object already in the session's identity map comes
+# back without SQL, otherwise the mapper's prebuilt by-id select runs.
+# Other lookups are lambda statements, whose cache key comes from the
+# lambda's code object: after the first call the statement is neither
+# rebuilt nor recompiled, only the new parameter value is bound. Hit rates
+# are in db_statement_cache_total and /api/system/stats.
+
+def user_by_username(db: Session, username: str) -> Optional[User]:
+    return db.execute(
+        lambda_stmt(lambda: select(User).where(User.username == username).limit(1))
+    ).scalars().first()
+
+def intern(db: Session, intern_id: int) -> Optional[Intern]:
+    return db.get(Intern, intern_id)
+
+def task(db: Session, task_id: int) -> Optional[Task]:
+    return db.get(Task, task_id)
@@ -0,0 +1,198 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, func, case, and_, or_, desc
+from sqlalchemy.orm import Session
+from app.models.intern import Intern, InternStatus
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.models.notification import Notification
+from app.models.archive import InternArchive, TaskArchive
+from app.utils.intern_archive import all_interns, all_tasks
+
+# Read-only queries for endpoints that never mutate what they load. They
+# run Core selects on the session's connection and return SQLAlchemy Row
+# tuples (attribute access by column name, no identity map, no lazy loads),
+# so the ORM's per-object bookkeeping is skipped. Anything that writes
+# loads entities as before.
+
+interns = Intern.__table__
+tasks = Task.__table__
+users = User.__table__
+notifications = Notification.__table__
+
+def _rows(db: Session, statement) -> list:
+    return db.connection().execute(statement).all()
+
+def _first(db: Session, statement):
+    return db.connection().execute(statement.limit(1)).first()
+
+def _scalar(db: Session, statement):
+    return db.connection().execute(statement).scalar()
+
+def count(db: Session, table, *criteria) -> int:
+    return _scalar(db, select(func.count()).select_from(table).where(*criteria))
+
+def user_count(db: Session) -> int:
+    return count(db, users)
+
+def intern_counts(db: Session, archived: bool = False):
+    """(total, active) interns in one query"""
+    table = InternArchive.__table__ if archived else interns
+    total, active = db.connection().execute(select(
+        func.count(),
+        func.sum(case((table.c.status == InternStatus.ACTIVE, 1), else_=0))
+    ).select_from(table)).one()
+    return total, active or 0
+
+def task_status_counts(db: Session, archived: bool = False) -> dict:
+    """{TaskStatus: tasks} in one grouped query"""
+    table = TaskArchive.__table__ if archived else tasks
+    return dict(_rows(db, select(table.c.status, func.count()).group_by(table.c.status)))
+
+def department_counts(db: Session, include_archived: bool = False) -> list:
+    """(department, intern_count) rows"""
+    table = all_interns() if include_archived else interns
+    return _rows(db, select(
+        table.c.department, func.count(table.c.id).label("intern_count")
+    ).group_by(table.c.department))
+
+def window_counts(db: Session, column, windows, *criteria) -> List[int]:
+    """Rows with column in each [start, end) window, counted in one query"""
+    row = db.connection().execute(select(*[
+        func.sum(case((and_(column >= start, column < end), 1), else_=0))
+        for start, end in windows
+    ]).select_from(column.table).where(
+        column >= min(start for start, _ in windows),
+        column < max(end for _, end in windows),
+        *criteria
+    )).one()
+    return [value or 0 for value in row]
+
+def department_task_rows(db: Session) -> list:
+    """(department, status, created_at, updated_at) for every task"""
+    return _rows(db, select(
+        interns.c.department, tasks.c.status, tasks.c.created_at, tasks.c.updated_at
+    ).join_from(interns, tasks, tasks.c.intern_id == interns.c.id))
+
+def active_intern_task_rows(db: Session) -> list:
+    """(id, full_name, department, status, created_at, updated_at) for every
+    task of an active intern, ordered by intern"""
+    return _rows(db, select(
+        interns.c.id, interns.c.full_name, interns.c.department,
+        tasks.c.status, tasks.c.created_at, tasks.c.updated_at
+    ).join_from(interns, tasks, tasks.c.intern_id == interns.c.id).where(
+        interns.c.status == InternStatus.ACTIVE
+    ).order_by(interns.c.id))
+
+def recent_interns(db: Session, since: datetime, limit: int) -> list:
+    """(id, full_name, department, created_at) of interns created since, newest first"""
+    return _rows(db, select(
+        interns.c.id, interns.c.full_name, interns.c.department, interns.c.created_at
+    ).where(interns.c.created_at >= since).order_by(desc(interns.c.created_at)).limit(limit))
+
+def task_activity(db: Session, status: TaskStatus, order_by, limit: int, *criteria) -> list:
+    """(id, title, deadline, updated_at, intern_name) of tasks in a status,
+    with the intern's name from an explicit join"""
+    return _rows(db, select(
+        tasks.c.id, tasks.c.title, tasks.c.deadline, tasks.c.updated_at,
+        interns.c.full_name.label("intern_name")
+    ).join_from(tasks, interns, tasks.c.intern_id == interns.c.id).where(
+        tasks.c.status == status, *criteria
+    ).order_by(desc(order_by)).limit(limit))
+
+def _intern_filters(table, search: Optional[str], department: Optional[str]) -> list:
+    criteria = []
+    if search:
+        # Literal substring match, as the intern mirror does: % and _ are not wildcards
+        pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        criteria.append(or_(
+            table.c.full_name.ilike(pattern, escape="\\"), table.c.email.ilike(pattern, escape="\\")
+        ))
+    if department:
+        criteria.append(table.c.department == department)
+    return criteria
+
+def intern_page(db: Session, fields, offset: int, limit: int, search: Optional[str] = None,
+                department: Optional[str] = None, include_archived: bool = False):
+    """(total, rows) for one page of the intern list.
+
+    Rows carry the given columns, plus `archived` with include_archived
+    (hot and archived interns through one UNION ALL, ordered by id).
+    """
+    table = all_interns() if include_archived else interns
+    criteria = _intern_filters(table, search, department)
+    columns = [table.c[field] for field in fields]
+    statement = select(*columns).where(*criteria)
+    if include_archived:
+        statement = select(*columns, table.c.archived).where(*criteria).order_by(table.c.id)
+    total = count(db, table, *criteria)
+    return total, _rows(db, statement.offset(offset).limit(limit))
+
+def intern_row(db: Session, intern_id: int, fields, archived: bool = False):
+    """One intern's columns, from the hot or the archive table; None if absent"""
+    table = InternArchive.__table__ if archived else interns
+    return _first(db, select(*[table.c[field] for field in fields]).where(table.c.id == intern_id))
+
+def _task_count_columns(table) -> list:
+    return [
+        func.count(table.c.id).label("total_tasks"),
+        func.sum(case((table.c.status == TaskStatus.COMPLETED, 1), else_=0)).label("completed_tasks"),
+        func.sum(case((table.c.status == TaskStatus.PENDING, 1), else_=0)).label("pending_tasks"),
+        func.sum(case((table.c.status == TaskStatus.OVERDUE, 1), else_=0)).label("overdue_tasks")
+    ]
+
+def intern_with_task_counts(db: Session, intern_id: int, fields, archived: bool = False):
+    """One intern's columns plus total_tasks, completed_tasks, pending_tasks
+    and overdue_tasks (None without tasks), from one query; None if absent"""
+    intern_table = InternArchive.__table__ if archived else interns
+    task_table = TaskArchive.__table__ if archived else tasks
+    counts = select(task_table.c.intern_id, *_task_count_columns(task_table)).where(
+        task_table.c.intern_id == intern_id
+    ).group_by(task_table.c.intern_id).subquery()
+    return _first(db, select(
+        *[intern_table.c[field] for field in fields],
+        counts.c.total_tasks, counts.c.completed_tasks, counts.c.pending_tasks, counts.c.overdue_tasks
+    ).outerjoin_from(intern_table, counts, counts.c.intern_id == intern_table.c.id).where(
+        intern_table.c.id == intern_id
+    ))
+
+def task_page(db: Session, intern_id: int, fields, sort: str, descending: bool, after, limit: int,
+              include_archived: bool = False):
+    """One keyset page of an intern's tasks ordered by `sort`, then id.
+
+    `after` is the (sort value, id) of the previous page's last row, or
+    None for the first page. Rows carry the given columns plus
+    `sort_value`. Returns (rows, whether more follow).
+    """
+    table = all_tasks() if include_archived else tasks
+    sort_column, id_column = table.c[sort], table.c.id
+    criteria = [table.c.intern_id == intern_id]
+    if after is not None:
+        value, last_id = after
+        if descending:
+            criteria.append(or_(sort_column < value, and_(sort_column == value, id_column < last_id)))
+        else:
+            criteria.append(or_(sort_column > value, and_(sort_column == value, id_column > last_id)))
+    order = [sort_column.desc(), id_column.desc()] if descending else [sort_column, id_column]
+    rows = _rows(db, select(
+        *[table.c[field] for field in fields], sort_column.label("sort_value")
+    ).where(*criteria).order_by(*order).limit(limit + 1))
+    return rows[:limit], len(rows) > limit
+
+def task_counts_by_intern(db: Session, intern_ids: List[int], include_archived: bool = False) -> dict:
+    """{intern_id: (total, completed, pending, overdue)} from one grouped query"""
+    if not intern_ids:
+        return {}
+    table = all_tasks() if include_archived else tasks
+    rows = _rows(db, select(table.c.intern_id, *_task_count_columns(table)).where(table.c.intern_id.in_(intern_ids)).group_by(table.c.intern_id))
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+def notification_page(db: Session, before: Optional[int], limit: int) -> list:
+    """Newest notifications first, older than the `before` id if given"""
+    statement = select(
+        notifications.c.id, notifications.c.type, notifications.c.title, notifications.c.message,
+        notifications.c.created_at, notifications.c.priority
+    )
+    if before is not None:
+        statement = statement.where(notifications.c.id < before)
+    return _rows(db, statement.order_by(notifications.c.id.desc()).limit(limit))
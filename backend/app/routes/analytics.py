@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func, case
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
-from config.database import get_db
+from app.utils.db_routing import get_read_db
 from app.models.intern import Intern, InternStatus
 from app.models.task import Task, TaskStatus
-from app.models.user import User
-from app.utils.auth import get_current_user
+from app.repositories import reads
+from app.utils.auth import get_current_username
+from app.utils.admission import route_class
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
@@ -45,142 +48,161 @@ class AnalyticsData(BaseModel):
     performanceMetrics: List[PerformanceMetric]
     recentActivity: List[RecentActivity]
 
-@router.get("", response_model=AnalyticsData)
-def get_analytics_data(
-    timeRange: str = Query("30d"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    # Parse time range
-    days_map = {"7d": 7, "30d": 30, "90d": 90, "1y": 365}
-    days = days_map.get(timeRange, 30)
+# Accepted timeRange values; anything else falls back to 30 days
+TIME_RANGES = {"7d": 7, "30d": 30, "90d": 90, "1y": 365}
+
+def analytics_data(db: Session, time_range: str) -> dict:
+    """The AnalyticsData payload, shared by the endpoint and report jobs"""
+    days = TIME_RANGES.get(time_range, 30)
     start_date = datetime.utcnow() - timedelta(days=days)
     
     # Basic stats
-    total_interns = db.query(Intern).count()
-    active_interns = db.query(Intern).filter(Intern.status == InternStatus.ACTIVE).count()
+    total_interns, active_interns = reads.intern_counts(db)
     inactive_interns = total_interns - active_interns
     
-    completed_tasks = db.query(Task).filter(Task.status == TaskStatus.COMPLETED).count()
-    pending_tasks = db.query(Task).filter(Task.status == TaskStatus.PENDING).count()
-    overdue_tasks = db.query(Task).filter(Task.status == TaskStatus.OVERDUE).count()
+    task_counts = reads.task_status_counts(db)
+    completed_tasks = task_counts.get(TaskStatus.COMPLETED, 0)
+    pending_tasks = task_counts.get(TaskStatus.PENDING, 0)
+    overdue_tasks = task_counts.get(TaskStatus.OVERDUE, 0)
     
     # Department stats
     dept_colors = ["#3b82f6", "#10b981", "#f59e0b", "#ef4444", "#8b5cf6", "#06b6d4"]
-    dept_stats = db.query(
-        Intern.department,
-        func.count(Intern.id).label('count')
-    ).group_by(Intern.department).all()
+    dept_stats = reads.department_counts(db)
     
     department_stats = [
-        DepartmentStat(
-            name=dept,
-            value=count,
-            color=dept_colors[i % len(dept_colors)]
-        )
+        {"name": dept, "value": count, "color": dept_colors[i % len(dept_colors)]}
         for i, (dept, count) in enumerate(dept_stats)
     ]
     
     # Monthly growth (last 6 months)
-    monthly_growth = []
+    month_windows = []
     for i in range(6):
         month_start = datetime.utcnow().replace(day=1) - timedelta(days=30*i)
-        month_end = month_start + timedelta(days=30)
-        
-        interns_count = db.query(Intern).filter(
-            Intern.created_at >= month_start,
-            Intern.created_at < month_end
-        ).count()
-        
-        tasks_count = db.query(Task).filter(
-            Task.created_at >= month_start,
-            Task.created_at < month_end
-        ).count()
-        
-        monthly_growth.append(MonthlyGrowth(
-            month=month_start.strftime("%b %Y"),
-            interns=interns_count,
-            tasks=tasks_count
-        ))
+        month_windows.append((month_start, month_start + timedelta(days=30)))
+    
+    interns_per_month = reads.window_counts(db, reads.interns.c.created_at, month_windows)
+    tasks_per_month = reads.window_counts(db, reads.tasks.c.created_at, month_windows)
+    
+    monthly_growth = [
+        {"month": month_start.strftime("%b %Y"), "interns": interns_count, "tasks": tasks_count}
+        for (month_start, _), interns_count, tasks_count in zip(month_windows, interns_per_month, tasks_per_month)
+    ]
     
     monthly_growth.reverse()
     
-    # Performance metrics by department
+    # Performance metrics by department (all tasks in one query, grouped here)
+    task_rows = reads.department_task_rows(db)
+    
+    tasks_by_department = {}
+    for row in task_rows:
+        tasks_by_department.setdefault(row.department, []).append(row)
+    
     performance_metrics = []
     for dept, _ in dept_stats:
-        dept_interns = db.query(Intern).filter(Intern.department == dept).all()
-        if not dept_interns:
-            continue
-            
-        total_tasks = 0
+        tasks = tasks_by_department.get(dept, [])
+        total_tasks = len(tasks)
         completed_tasks_dept = 0
         total_completion_time = 0
         completed_with_time = 0
         
-        for intern in dept_interns:
-            tasks = db.query(Task).filter(Task.intern_id == intern.id).all()
-            total_tasks += len(tasks)
-            
-            for task in tasks:
-                if task.status == TaskStatus.COMPLETED:
-                    completed_tasks_dept += 1
-                    if task.created_at and task.updated_at:
-                        completion_time = (task.updated_at - task.created_at).days
-                        total_completion_time += max(1, completion_time)
-                        completed_with_time += 1
+        for task in tasks:
+            if task.status == TaskStatus.COMPLETED:
+                completed_tasks_dept += 1
+                if task.created_at and task.updated_at:
+                    completion_time = (task.updated_at - task.created_at).days
+                    total_completion_time += max(1, completion_time)
+                    completed_with_time += 1
         
-        completion_rate = (completed_tasks_dept / total_tasks * 100) if total_tasks > 0 else 0
+        completion_rate = (completed_tasks_dept / total_tasks * 100) if total_tasks > 0 else 0.0
         avg_completion_time = (total_completion_time / completed_with_time) if completed_with_time > 0 else 0
-        efficiency = (100 - min(avg_completion_time * 10, 100)) if avg_completion_time > 0 else 0
+        efficiency = float(100 - min(avg_completion_time * 10, 100)) if avg_completion_time > 0 else 0.0
         
-        performance_metrics.append(PerformanceMetric(
-            department=dept,
-            completion=round(completion_rate, 1),
-            efficiency=round(efficiency, 1)
-        ))
+        performance_metrics.append({
+            "department": dept,
+            "completion": round(completion_rate, 1),
+            "efficiency": round(efficiency, 1)
+        })
     
     # Recent activity (last 7 days)
-    recent_activity = []
-    for i in range(7):
-        date = datetime.utcnow().date() - timedelta(days=i)
-        date_start = datetime.combine(date, datetime.min.time())
-        date_end = datetime.combine(date, datetime.max.time())
-        
-        active_count = db.query(Intern).filter(
-            Intern.status == InternStatus.ACTIVE,
-            Intern.updated_at >= date_start,
-            Intern.updated_at <= date_end
-        ).count()
-        
-        joined_count = db.query(Intern).filter(
-            Intern.created_at >= date_start,
-            Intern.created_at <= date_end
-        ).count()
-        
-        completed_count = db.query(Task).filter(
-            Task.status == TaskStatus.COMPLETED,
-            Task.updated_at >= date_start,
-            Task.updated_at <= date_end
-        ).count()
-        
-        recent_activity.append(RecentActivity(
-            date=date.strftime("%Y-%m-%d"),
-            active=active_count,
-            joined=joined_count,
-            completed=completed_count
-        ))
+    days_back = [datetime.utcnow().date() - timedelta(days=i) for i in range(7)]
+    day_windows = [
+        (datetime.combine(date, datetime.min.time()), datetime.combine(date + timedelta(days=1), datetime.min.time()))
+        for date in days_back
+    ]
+    
+    intern_columns, task_columns = reads.interns.c, reads.tasks.c
+    active_per_day = reads.window_counts(
+        db, intern_columns.updated_at, day_windows, intern_columns.status == InternStatus.ACTIVE
+    )
+    joined_per_day = reads.window_counts(db, intern_columns.created_at, day_windows)
+    completed_per_day = reads.window_counts(
+        db, task_columns.updated_at, day_windows, task_columns.status == TaskStatus.COMPLETED
+    )
+    
+    recent_activity = [
+        {"date": date.strftime("%Y-%m-%d"), "active": active_count, "joined": joined_count, "completed": completed_count}
+        for date, active_count, joined_count, completed_count
+        in zip(days_back, active_per_day, joined_per_day, completed_per_day)
+    ]
     
     recent_activity.reverse()
     
-    return AnalyticsData(
-        totalInterns=total_interns,
-        activeInterns=active_interns,
-        inactiveInterns=inactive_interns,
-        completedTasks=completed_tasks,
-        pendingTasks=pending_tasks,
-        overdueTasks=overdue_tasks,
-        departmentStats=department_stats,
-        monthlyGrowth=monthly_growth,
-        performanceMetrics=performance_metrics,
-        recentActivity=recent_activity
-    )
\ No newline at end of file
+    return {
+        "totalInterns": total_interns,
+        "activeInterns": active_interns,
+        "inactiveInterns": inactive_interns,
+        "completedTasks": completed_tasks,
+        "pendingTasks": pending_tasks,
+        "overdueTasks": overdue_tasks,
+        "departmentStats": department_stats,
+        "monthlyGrowth": monthly_growth,
+        "performanceMetrics": performance_metrics,
+        "recentActivity": recent_activity
+    }
+
+@router.get("", response_model=AnalyticsData)
+@query_budget(9)
+@route_class("heavy")
+def get_analytics_data(
+    timeRange: str = Query("30d"),
+    db: Session = Depends(get_read_db),
+    current_user: str = Depends(get_current_username)
+):
+    return json_response(analytics_data(db, timeRange))
+
+def department_report(db: Session, time_range: str) -> List[dict]:
+    """Per-department intern and task counts, for tasks created within the range"""
+    start_date = datetime.utcnow() - timedelta(days=TIME_RANGES.get(time_range, 30))
+    interns = db.query(
+        Intern.department,
+        func.count(Intern.id),
+        func.sum(case((Intern.status == InternStatus.ACTIVE, 1), else_=0))
+    ).group_by(Intern.department).all()
+    tasks = {
+        row.department: row for row in db.query(
+            Intern.department,
+            func.count(Task.id).label("total"),
+            func.sum(case((Task.status == TaskStatus.COMPLETED, 1), else_=0)).label("completed"),
+            func.sum(case((Task.status == TaskStatus.PENDING, 1), else_=0)).label("pending"),
+            func.sum(case((Task.status == TaskStatus.OVERDUE, 1), else_=0)).label("overdue")
+        ).join(Task, Task.intern_id == Intern.id).filter(
+            Task.created_at >= start_date
+        ).group_by(Intern.department).all()
+    }
+
+    rows = []
+    for department, intern_count, active_count in interns:
+        task_row = tasks.get(department)
+        total = task_row.total if task_row else 0
+        completed = (task_row.completed or 0) if task_row else 0
+        rows.append({
+            "department": department,
+            "interns": intern_count,
+            "active_interns": active_count or 0,
+            "tasks": total,
+            "completed_tasks": completed,
+            "pending_tasks": (task_row.pending or 0) if task_row else 0,
+            "overdue_tasks": (task_row.overdue or 0) if task_row else 0,
+            "completion_rate": round(completed / total * 100, 1) if total else 0.0
+        })
+    return rows
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from config.database import get_db
 from app.models.user import User
-from app.utils.auth import verify_password, create_access_token
+from app.utils.auth import create_access_token
+from app.utils.password_hashing import password_hasher
+from app.utils.rate_limit import login_rate_limiter, client_ip
+from app.utils.query_budget import query_budget
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -12,12 +16,22 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
-@router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def find_user(db: Session, login: str):
     # Try to find user by username or email
-    user = db.query(User).filter(
-        (User.username == form_data.username) | (User.email == form_data.username)
+    return db.query(User).filter(
+        (User.username == login) | (User.email == login)
     ).first()
+
+@router.post("/login", response_model=Token)
+@query_budget(2)
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # Throttle per IP and per username before spending any bcrypt time
+    if login_rate_limiter.store.blocking:
+        await run_in_threadpool(login_rate_limiter.check, client_ip(request), form_data.username)
+    else:
+        login_rate_limiter.check(client_ip(request), form_data.username)
+    
+    user = await run_in_threadpool(find_user, db, form_data.username)
     
     if not user:
         raise HTTPException(
@@ -25,11 +39,18 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
             detail="Incorrect username or password"
         )
     
-    if not verify_password(form_data.password, user.hashed_password):
+    # bcrypt runs in the hashing pool so a login burst can't starve other requests
+    valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
     
+    if new_hash:
+        # Cost settings changed since this hash was made
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
+    
     access_token = create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+from config.database import settings
+from app.models.user import User
+from app.utils.auth import get_current_user, security
+from app.utils.admission import route_class
+from app.utils.batch import run_batch
+from app.utils.db_routing import read_sessionmaker, read_only
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    method: Literal["GET"] = "GET"
+    path: str
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+class BatchItemResponse(BaseModel):
+    id: str
+    status: int
+    headers: Dict[str, str]
+    body: Any
+
+class BatchResponse(BaseModel):
+    responses: List[BatchItemResponse]
+
+@router.post("", response_model=BatchResponse)
+@query_budget(1)
+@route_class("heavy")
+@read_only
+async def run_batch_requests(
+    batch: BatchRequest,
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user)
+):
+    """Run several GET requests in one round trip.
+
+    The token is checked once and the sub-requests share read sessions, so
+    e.g. the dashboard loads with one request instead of six. Each item gets
+    its own status; a failing item does not fail the batch. Sub-requests
+    skip the HTTP middlewares (CORS, compression, admission), which apply
+    to the batch as a whole.
+    """
+    if not batch.requests:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Batch is empty")
+    if len(batch.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_max_requests} requests per batch"
+        )
+
+    results = [None] * len(batch.requests)
+    runnable, positions = [], []
+    for position, item in enumerate(batch.requests):
+        item_id = item.id if item.id is not None else str(position)
+        if not item.path.startswith("/api/") or item.path.split("?")[0].rstrip("/") == "/api/batch":
+            results[position] = {
+                "id": item_id, "status": status.HTTP_400_BAD_REQUEST, "headers": {},
+                "body": {"detail": "Path must be an /api/ GET endpoint other than /api/batch"}
+            }
+            continue
+        runnable.append((item_id, item.path))
+        positions.append(position)
+
+    if runnable:
+        principal = (credentials.credentials, current_user.username, current_user)
+        dispatched = await run_batch(
+            request.scope, runnable, principal, read_sessionmaker(request), settings.batch_lanes
+        )
+        for position, result in zip(positions, dispatched):
+            results[position] = result
+    return json_response({"responses": results})
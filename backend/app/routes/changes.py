@@ -0,0 +1,103 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import Optional
+from datetime import datetime, timedelta
+from config.database import settings
+from app.utils.db_routing import get_read_db
+from app.models.change_log import ChangeLog
+from app.models.intern import Intern
+from app.models.task import Task
+from app.models.notification import Notification, NotificationInbox
+from app.models.user import User
+from app.utils.auth import get_current_user
+from app.utils.notification_inbox import read_ids
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
+from app.routes.interns import INTERN_FIELDS, intern_dict
+from app.routes.tasks import TASK_COLUMNS, task_dict
+from app.routes.notifications import notification_dict
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+ENTITY_KEYS = {"intern": "interns", "task": "tasks", "notification": "notifications"}
+
+def feed(cursor: int, has_more: bool = False) -> dict:
+    response = {"cursor": cursor, "has_more": has_more, "deleted": {}}
+    for key in ENTITY_KEYS.values():
+        response[key] = []
+        response["deleted"][key] = []
+    return response
+
+def notification_read_state(db: Session, user: User, notifications):
+    inbox = db.query(NotificationInbox).filter(NotificationInbox.user_id == user.id).first()
+    if inbox is None:
+        # The inbox is created at the head of the feed on first use, so
+        # everything that exists now would start out read
+        return {n.id for n in notifications}
+    return read_ids(db, inbox, [n.id for n in notifications])
+
+@router.get("")
+@query_budget(7)
+def get_changes(
+    since: Optional[int] = Query(None, ge=0, description="Cursor from the previous response; omit to get the current one"),
+    limit: int = Query(500, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Interns, tasks and notifications changed since a cursor.
+
+    Clients load their lists once, keep the cursor from GET /changes, then
+    poll with since=<cursor>: changed entities come back in their current
+    state and deleted (or archived) ones as ids under "deleted". Follow
+    has_more with the returned cursor until it is false. Entries younger
+    than CHANGE_FEED_SETTLE_MS are held back, so a transaction that
+    committed after a later one can't be skipped past.
+    """
+    settled = datetime.utcnow() - timedelta(milliseconds=settings.change_feed_settle_ms)
+    if since is None:
+        cursor = db.query(func.max(ChangeLog.seq)).filter(ChangeLog.changed_at < settled).scalar()
+        return json_response(feed(cursor or 0))
+
+    entries = db.query(
+        ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op, ChangeLog.changed_at
+    ).filter(ChangeLog.seq > since).order_by(ChangeLog.seq).limit(limit + 1).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    for position, entry in enumerate(entries):
+        if entry.changed_at >= settled:
+            entries, has_more = entries[:position], False
+            break
+    if not entries:
+        return json_response(feed(since))
+
+    # Only the last operation on each entity matters
+    latest = {}
+    for entry in entries:
+        latest[(entry.entity, entry.entity_id)] = entry.op
+    wanted = {entity: [] for entity in ENTITY_KEYS}
+    deleted = {entity: set() for entity in ENTITY_KEYS}
+    for (entity, entity_id), op in latest.items():
+        if op == "delete":
+            deleted[entity].add(entity_id)
+        else:
+            wanted[entity].append(entity_id)
+
+    response = feed(entries[-1].seq, has_more)
+    if wanted["intern"]:
+        interns = db.query(Intern).filter(Intern.id.in_(wanted["intern"])).all()
+        response["interns"] = [intern_dict(intern, fields=INTERN_FIELDS) for intern in interns]
+    if wanted["task"]:
+        tasks = db.query(*TASK_COLUMNS).filter(Task.id.in_(wanted["task"])).all()
+        response["tasks"] = [task_dict(task) for task in tasks]
+    if wanted["notification"]:
+        notifications = db.query(Notification).filter(Notification.id.in_(wanted["notification"])).all()
+        read = notification_read_state(db, current_user, notifications)
+        response["notifications"] = [notification_dict(n, n.id in read) for n in notifications]
+
+    # Changed since the cursor but gone now (deleted later, or archived)
+    for entity, key in ENTITY_KEYS.items():
+        found = {item["id"] for item in response[key]}
+        deleted[entity].update(set(wanted[entity]) - found)
+        response["deleted"][key] = sorted(deleted[entity])
+    return json_response(response)
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
 from pydantic import BaseModel
 from typing import List
 from datetime import datetime, timedelta
-from config.database import get_db
-from app.models.intern import Intern, InternStatus
-from app.models.task import Task, TaskStatus
-from app.models.user import User
-from app.utils.auth import get_current_user
+from app.utils.db_routing import get_read_db
+from app.utils.intern_mirror import intern_directory
+from app.models.task import TaskStatus
+from app.repositories import reads
+from app.utils.auth import get_current_username
+from app.utils.admission import route_class
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
@@ -40,108 +42,111 @@ class TopPerformer(BaseModel):
     avgCompletionTime: float
 
 @router.get("/stats", response_model=DashboardStats)
+@query_budget(5)
+@route_class("heavy")
 def get_dashboard_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    include_archived: bool = Query(False),
+    db: Session = Depends(get_read_db),
+    current_user: str = Depends(get_current_username)
 ):
-    total_users = db.query(User).count()
-    total_interns = db.query(Intern).count()
-    active_interns = db.query(Intern).filter(Intern.status == InternStatus.ACTIVE).count()
-    total_tasks = db.query(Task).count()
-    pending_tasks = db.query(Task).filter(Task.status == TaskStatus.PENDING).count()
-    completed_tasks = db.query(Task).filter(Task.status == TaskStatus.COMPLETED).count()
-    overdue_tasks = db.query(Task).filter(Task.status == TaskStatus.OVERDUE).count()
+    total_users = reads.user_count(db)
+    mirror = intern_directory(request)
+    total_interns, active_interns = mirror.counts() if mirror else reads.intern_counts(db)
+    task_counts = reads.task_status_counts(db)
     
-    return DashboardStats(
-        total_users=total_users,
-        total_interns=total_interns,
-        active_interns=active_interns,
-        total_tasks=total_tasks,
-        pending_tasks=pending_tasks,
-        completed_tasks=completed_tasks,
-        overdue_tasks=overdue_tasks
-    )
+    if include_archived:
+        # Archived interns are all inactive, so only the totals and task counts grow
+        total_interns += reads.intern_counts(db, archived=True)[0]
+        for task_status, count in reads.task_status_counts(db, archived=True).items():
+            task_counts[task_status] = task_counts.get(task_status, 0) + count
+    
+    return json_response({
+        "total_users": total_users,
+        "total_interns": total_interns,
+        "active_interns": active_interns,
+        "total_tasks": sum(task_counts.values()),
+        "pending_tasks": task_counts.get(TaskStatus.PENDING, 0),
+        "completed_tasks": task_counts.get(TaskStatus.COMPLETED, 0),
+        "overdue_tasks": task_counts.get(TaskStatus.OVERDUE, 0)
+    })
 
 @router.get("/departments")
+@query_budget(1)
+@route_class("heavy")
 def get_department_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    include_archived: bool = Query(False),
+    db: Session = Depends(get_read_db),
+    current_user: str = Depends(get_current_username)
 ):
-    department_stats = db.query(
-        Intern.department,
-        func.count(Intern.id).label('intern_count')
-    ).group_by(Intern.department).all()
+    mirror = None if include_archived else intern_directory(request)
+    department_stats = mirror.department_counts() if mirror else reads.department_counts(db, include_archived)
     
-    return [
+    return json_response([
         {"department": dept, "intern_count": count}
         for dept, count in department_stats
-    ]
+    ])
 
 @router.get("/recent-activities", response_model=List[RecentActivity])
+@query_budget(3)
 def get_recent_activities(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: str = Depends(get_current_username)
 ):
     activities = []
+    week_ago = datetime.utcnow() - timedelta(days=7)
     
     # Recent interns (last 7 days)
-    recent_interns = db.query(Intern).filter(
-        Intern.created_at >= datetime.utcnow() - timedelta(days=7)
-    ).order_by(desc(Intern.created_at)).limit(5).all()
-    
-    for intern in recent_interns:
-        activities.append(RecentActivity(
-            id=f"intern_{intern.id}",
-            message=f"New intern {intern.full_name} joined {intern.department}",
-            timestamp=intern.created_at.strftime("%Y-%m-%d %H:%M"),
-            type="success"
-        ))
-    
-    # Recent completed tasks (last 7 days)
-    recent_tasks = db.query(Task).join(Intern).filter(
-        Task.status == TaskStatus.COMPLETED,
-        Task.updated_at >= datetime.utcnow() - timedelta(days=7)
-    ).order_by(desc(Task.updated_at)).limit(5).all()
+    for intern in reads.recent_interns(db, week_ago, 5):
+        activities.append({
+            "id": f"intern_{intern.id}",
+            "message": f"New intern {intern.full_name} joined {intern.department}",
+            "timestamp": intern.created_at.strftime("%Y-%m-%d %H:%M"),
+            "type": "success"
+        })
     
+    # Recent completed tasks (last 7 days), with the intern's name joined in
+    recent_tasks = reads.task_activity(
+        db, TaskStatus.COMPLETED, reads.tasks.c.updated_at, 5, reads.tasks.c.updated_at >= week_ago
+    )
     for task in recent_tasks:
-        activities.append(RecentActivity(
-            id=f"task_{task.id}",
-            message=f"{task.intern.full_name} completed '{task.title}'",
-            timestamp=task.updated_at.strftime("%Y-%m-%d %H:%M"),
-            type="success"
-        ))
+        activities.append({
+            "id": f"task_{task.id}",
+            "message": f"{task.intern_name} completed '{task.title}'",
+            "timestamp": task.updated_at.strftime("%Y-%m-%d %H:%M"),
+            "type": "success"
+        })
     
     # Overdue tasks
-    overdue_tasks = db.query(Task).join(Intern).filter(
-        Task.status == TaskStatus.OVERDUE
-    ).order_by(desc(Task.deadline)).limit(3).all()
-    
-    for task in overdue_tasks:
-        activities.append(RecentActivity(
-            id=f"overdue_{task.id}",
-            message=f"Task '{task.title}' is overdue for {task.intern.full_name}",
-            timestamp=task.deadline.strftime("%Y-%m-%d"),
-            type="warning"
-        ))
+    for task in reads.task_activity(db, TaskStatus.OVERDUE, reads.tasks.c.deadline, 3):
+        activities.append({
+            "id": f"overdue_{task.id}",
+            "message": f"Task '{task.title}' is overdue for {task.intern_name}",
+            "timestamp": task.deadline.strftime("%Y-%m-%d"),
+            "type": "warning"
+        })
     
     # Sort by timestamp and return latest 10
-    activities.sort(key=lambda x: x.timestamp, reverse=True)
-    return activities[:10]
+    activities.sort(key=lambda x: x["timestamp"], reverse=True)
+    return json_response(activities[:10])
 
 @router.get("/top-performers", response_model=List[TopPerformer])
+@query_budget(1)
+@route_class("heavy")
 def get_top_performers(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: str = Depends(get_current_username)
 ):
-    # Get interns with their task statistics
-    interns = db.query(Intern).filter(Intern.status == InternStatus.ACTIVE).all()
-    performers = []
+    # Every active intern's tasks in one query, grouped here
+    rows = reads.active_intern_task_rows(db)
     
-    for intern in interns:
-        tasks = db.query(Task).filter(Task.intern_id == intern.id).all()
-        if not tasks:
-            continue
-            
+    tasks_by_intern = {}
+    for row in rows:
+        tasks_by_intern.setdefault((row.id, row.full_name, row.department), []).append(row)
+    
+    performers = []
+    for (intern_id, name, department), tasks in tasks_by_intern.items():
         total_tasks = len(tasks)
         completed_tasks = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
         
@@ -157,17 +162,17 @@ def get_top_performers(
                 completion_time = (task.updated_at - task.created_at).days
                 completed_task_times.append(max(1, completion_time))  # At least 1 day
         
-        avg_completion_time = sum(completed_task_times) / len(completed_task_times) if completed_task_times else 0
+        avg_completion_time = sum(completed_task_times) / len(completed_task_times) if completed_task_times else 0.0
         
-        performers.append(TopPerformer(
-            id=intern.id,
-            name=intern.full_name,
-            department=intern.department,
-            completedTasks=completed_tasks,
-            completionRate=round(completion_rate, 1),
-            avgCompletionTime=round(avg_completion_time, 1)
-        ))
+        performers.append({
+            "id": intern_id,
+            "name": name,
+            "department": department,
+            "completedTasks": completed_tasks,
+            "completionRate": round(completion_rate, 1),
+            "avgCompletionTime": round(avg_completion_time, 1)
+        })
     
     # Sort by completion rate and then by number of completed tasks
-    performers.sort(key=lambda x: (x.completionRate, x.completedTasks), reverse=True)
-    return performers[:5]
\ No newline at end of file
+    performers.sort(key=lambda x: (x["completionRate"], x["completedTasks"]), reverse=True)
+    return json_response(performers[:5])
\ No newline at end of file
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from datetime import datetime
 import json
 from config.database import get_db
+from app.utils.db_routing import get_read_db
 from app.models.intern import Intern, InternStatus
-from app.models.task import Task, TaskStatus
 from app.models.user import User
 from app.utils.auth import get_current_user
+from app.utils.intern_archive import restore_interns
+from app.utils.intern_mirror import intern_directory, directory_fields
+from app.repositories import reads, lookups
+from app.utils.fieldsets import parse_fields, parse_include
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
 from app.routes.notifications import create_notification
+from app.routes.tasks import TaskResponse, TASK_FIELDS, task_dict, parse_task_sort, task_cursor
 
 router = APIRouter(prefix="/interns", tags=["interns"])
 
@@ -40,6 +47,10 @@ class TaskStats(BaseModel):
     overdue_tasks: int
     completion_rate: float
 
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None  # for GET /tasks/intern/{id}?cursor= with the same sort
+
 class InternResponse(BaseModel):
     id: int
     full_name: str
@@ -52,92 +63,153 @@ class InternResponse(BaseModel):
     join_date: datetime
     status: InternStatus
     task_stats: Optional[TaskStats] = None
+    archived: Optional[bool] = None  # only with include_archived=true
+    tasks: Optional[TaskPage] = None  # only with include=tasks
     
     class Config:
         from_attributes = True
-        
-    @classmethod
-    def from_orm(cls, obj, task_stats=None):
-        skills = []
-        if obj.skills:
-            try:
-                skills = json.loads(obj.skills)
-            except:
-                skills = []
-        
-        return cls(
-            id=obj.id,
-            full_name=obj.full_name,
-            email=obj.email,
-            phone=obj.phone,
-            department=obj.department,
-            position=obj.position,
-            university=obj.university,
-            skills=skills,
-            join_date=obj.join_date,
-            status=obj.status,
-            task_stats=task_stats
-        )
+
+# Fields selectable with ?fields=, in response order; id is always returned
+INTERN_FIELDS = ("id", "full_name", "email", "phone", "department", "position",
+                 "university", "skills", "join_date", "status")
+INTERN_INCLUDES = ("task_stats",)
+# get_intern can also embed the first page of the intern's tasks
+INTERN_DETAIL_INCLUDES = INTERN_INCLUDES + ("tasks",)
+
+def parse_skills(value) -> list:
+    if not value:
+        return []
+    try:
+        return json.loads(value)
+    except ValueError:
+        return []
+
+def intern_dict(intern, task_stats=None, fields=None) -> dict:
+    """InternResponse-shaped dict, serialized by json_response without a model.
+
+    With a sparse fieldset only those fields (attributes of an Intern or a
+    projected row) are returned, plus task_stats when it was computed.
+    """
+    response = {field: getattr(intern, field) for field in fields or INTERN_FIELDS}
+    if "skills" in response:
+        response["skills"] = parse_skills(response["skills"])
+    if fields is None or task_stats is not None:
+        response["task_stats"] = task_stats
+    return response
+
+def sparse_request(fields: Optional[str], include: Optional[str], allowed_includes=INTERN_INCLUDES):
+    """(field list or None, set of expansions) for ?fields= and ?include=.
+
+    Without either parameter the full response, task_stats included, is
+    returned as before; once either is given task_stats is opt-in.
+    """
+    field_list = parse_fields(fields, INTERN_FIELDS)
+    includes = parse_include(include, allowed_includes)
+    if fields is None and include is None:
+        return None, {"task_stats"}
+    return field_list, includes
+
+def task_stats_dict(total_tasks, completed_tasks, pending_tasks, overdue_tasks) -> dict:
+    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
+    return {
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "pending_tasks": pending_tasks,
+        "overdue_tasks": overdue_tasks,
+        "completion_rate": round(completion_rate, 1)
+    }
+
+def task_stats_by_intern(db: Session, intern_ids: List[int], include_archived: bool = False):
+    """TaskStats-shaped dicts for each intern, from one grouped query"""
+    counts = reads.task_counts_by_intern(db, intern_ids, include_archived)
+    return {intern_id: task_stats_dict(*counts.get(intern_id, (0, 0, 0, 0))) for intern_id in intern_ids}
 
 class InternsListResponse(BaseModel):
     interns: List[InternResponse]
     total: int
 
 @router.get("", response_model=InternsListResponse)
+@query_budget(4)
 def get_interns(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    include_archived: bool = Query(False),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,full_name,status"),
+    include: Optional[str] = Query(None, description="Expansions: task_stats"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(Intern)
-    
-    if search:
-        query = query.filter(
-            or_(
-                Intern.full_name.ilike(f"%{search}%"),
-                Intern.email.ilike(f"%{search}%")
-            )
+    field_list, includes = sparse_request(fields, include)
+    # Directory-only pages (e.g. fields=id,full_name,department) come from
+    # the worker's intern mirror when it is enabled and current
+    mirror = None
+    if directory_fields(field_list) and not includes and not include_archived:
+        mirror = intern_directory(request)
+    if mirror:
+        total, interns = mirror.page((page - 1) * limit, limit, search=search, department=department)
+    else:
+        # Only the requested columns are selected; with include_archived hot and
+        # archived rows come through one UNION ALL, ordered for stable pages
+        total, interns = reads.intern_page(
+            db, field_list or INTERN_FIELDS, (page - 1) * limit, limit,
+            search=search, department=department, include_archived=include_archived
         )
     
-    if department:
-        query = query.filter(Intern.department == department)
-    
-    total = query.count()
-    interns = query.offset((page - 1) * limit).limit(limit).all()
-    
     # Convert to response format with proper skills parsing and task stats
-    intern_responses = []
-    for intern in interns:
-        # Calculate task statistics
-        tasks = db.query(Task).filter(Task.intern_id == intern.id).all()
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-        pending_tasks = len([t for t in tasks if t.status == TaskStatus.PENDING])
-        overdue_tasks = len([t for t in tasks if t.status == TaskStatus.OVERDUE])
-        completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        task_stats = TaskStats(
-            total_tasks=total_tasks,
-            completed_tasks=completed_tasks,
-            pending_tasks=pending_tasks,
-            overdue_tasks=overdue_tasks,
-            completion_rate=round(completion_rate, 1)
-        )
-        
-        intern_responses.append(InternResponse.from_orm(intern, task_stats))
+    task_stats = {}
+    if "task_stats" in includes:
+        task_stats = task_stats_by_intern(db, [intern.id for intern in interns], include_archived)
+    intern_responses = [intern_dict(intern, task_stats.get(intern.id), field_list) for intern in interns]
+    if include_archived:
+        for response, intern in zip(intern_responses, interns):
+            response["archived"] = intern.archived
     
-    return InternsListResponse(interns=intern_responses, total=total)
+    return json_response({"interns": intern_responses, "total": total})
 
 @router.get("/{intern_id}", response_model=InternResponse)
+@query_budget(4)
 def get_intern(
+    request: Request,
     intern_id: int,
-    db: Session = Depends(get_db),
+    include_archived: bool = Query(False),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    include: Optional[str] = Query(None, description="Expansions: task_stats, tasks"),
+    tasks_sort: str = Query("deadline", description="Order of the embedded tasks, as in GET /tasks/intern/{id}"),
+    tasks_limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    intern = db.query(Intern).filter(Intern.id == intern_id).first()
+    """One intern. include=tasks adds task_stats and the first page of their
+    tasks in two queries, however many tasks they have; later pages come
+    from GET /tasks/intern/{id} with the returned cursor."""
+    field_list, includes = sparse_request(fields, include, INTERN_DETAIL_INCLUDES)
+    columns = field_list or INTERN_FIELDS
+    with_tasks = "tasks" in includes
+    if with_tasks:
+        sort_key, descending = parse_task_sort(tasks_sort)
+    
+    mirror = None
+    if directory_fields(field_list) and not includes and not include_archived:
+        mirror = intern_directory(request)
+    if mirror:
+        intern = mirror.get(intern_id)
+        if not intern:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Intern not found"
+            )
+        return json_response(intern_dict(intern, None, field_list))
+    
+    # With include=tasks the task counts come with the intern row
+    lookup = reads.intern_with_task_counts if with_tasks else reads.intern_row
+    intern = lookup(db, intern_id, columns)
+    archived = False
+    if not intern and include_archived:
+        intern = lookup(db, intern_id, columns, archived=True)
+        archived = intern is not None
     if not intern:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -145,24 +217,54 @@ def get_intern(
         )
     
     # Calculate task statistics
-    tasks = db.query(Task).filter(Task.intern_id == intern.id).all()
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-    pending_tasks = len([t for t in tasks if t.status == TaskStatus.PENDING])
-    overdue_tasks = len([t for t in tasks if t.status == TaskStatus.OVERDUE])
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    task_stats = TaskStats(
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        pending_tasks=pending_tasks,
-        overdue_tasks=overdue_tasks,
-        completion_rate=round(completion_rate, 1)
-    )
+    task_stats = None
+    if with_tasks:
+        task_stats = task_stats_dict(
+            intern.total_tasks or 0, intern.completed_tasks or 0, intern.pending_tasks or 0, intern.overdue_tasks or 0
+        )
+    elif "task_stats" in includes:
+        task_stats = task_stats_by_intern(db, [intern.id], archived)[intern.id]
+    
+    response = intern_dict(intern, task_stats, field_list)
+    if with_tasks:
+        rows, has_more = reads.task_page(
+            db, intern.id, TASK_FIELDS, sort_key, descending, None, tasks_limit, include_archived=archived
+        )
+        response["tasks"] = {
+            "items": [task_dict(row) for row in rows],
+            "next_cursor": task_cursor(rows[-1], sort_key, descending) if has_more else None
+        }
+    if include_archived:
+        response["archived"] = archived
+    return json_response(response)
+
+@router.post("/{intern_id}/restore", response_model=InternResponse)
+@query_budget(11)
+def restore_intern(
+    intern_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Move an archived intern and their tasks back to the active tables"""
+    try:
+        restored = restore_interns(db, [intern_id])
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Intern id or email is in use again; cannot restore"
+        )
+    if not restored:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived intern not found"
+        )
     
-    return InternResponse.from_orm(intern, task_stats)
+    intern = lookups.intern(db, intern_id)
+    task_stats = task_stats_by_intern(db, [intern.id])[intern.id]
+    return json_response(intern_dict(intern, task_stats))
 
 @router.post("", response_model=InternResponse)
+@query_budget(9)
 def create_intern(
     intern: InternCreate,
     db: Session = Depends(get_db),
@@ -194,16 +296,17 @@ def create_intern(
         priority="medium"
     )
     
-    return InternResponse.from_orm(db_intern)
+    return json_response(intern_dict(db_intern))
 
 @router.put("/{intern_id}", response_model=InternResponse)
+@query_budget(5)
 def update_intern(
     intern_id: int,
     intern_update: InternUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    intern = db.query(Intern).filter(Intern.id == intern_id).first()
+    intern = lookups.intern(db, intern_id)
     if not intern:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -219,15 +322,16 @@ def update_intern(
     
     db.commit()
     db.refresh(intern)
-    return InternResponse.from_orm(intern)
+    return json_response(intern_dict(intern))
 
 @router.delete("/{intern_id}")
+@query_budget(6)
 def delete_intern(
     intern_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    intern = db.query(Intern).filter(Intern.id == intern_id).first()
+    intern = lookups.intern(db, intern_id)
     if not intern:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from config.database import get_db
 from app.models.notification import Notification
-from typing import List
+from app.models.user import User
+from app.repositories import reads
+from app.utils.auth import get_current_user
+from app.utils.notification_inbox import get_inbox, deliver, read_ids, mark_read, mark_read_up_to
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
+from typing import List, Optional
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -16,40 +22,86 @@ class NotificationResponse(BaseModel):
     created_at: str
     priority: str
 
+class MarkReadRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    up_to: Optional[int] = None
+
+def notification_dict(notification, is_read: bool) -> dict:
+    """NotificationResponse-shaped dict from a Notification or a row; is_read
+    is per user (see read_ids)"""
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.message,
+        "is_read": is_read,
+        "created_at": notification.created_at.isoformat(),
+        "priority": notification.priority
+    }
+
 @router.get("/", response_model=List[NotificationResponse])
-async def get_notifications(db: Session = Depends(get_db)):
-    notifications = db.query(Notification).order_by(Notification.created_at.desc()).limit(50).all()
-    return [
-        NotificationResponse(
-            id=n.id,
-            type=n.type,
-            title=n.title,
-            message=n.message,
-            is_read=n.is_read,
-            created_at=n.created_at.isoformat(),
-            priority=n.priority
-        ) for n in notifications
-    ]
+@query_budget(7)
+def get_notifications(
+    before: Optional[int] = Query(None, description="Cursor: return notifications older than this id"),
+    limit: int = Query(50, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    inbox = get_inbox(db, current_user)
+    notifications = reads.notification_page(db, before, limit)
+
+    headers = {}
+    if len(notifications) == limit:
+        headers["X-Next-Cursor"] = str(notifications[-1].id)
+
+    read = read_ids(db, inbox, [n.id for n in notifications])
+    return json_response([notification_dict(n, n.id in read) for n in notifications], headers=headers)
 
 @router.get("/unread-count")
-async def get_unread_count(db: Session = Depends(get_db)):
-    count = db.query(Notification).filter(Notification.is_read == False).count()
-    return {"count": count}
+@query_budget(6)
+def get_unread_count(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    # Single-row read of the maintained per-user counter
+    inbox = get_inbox(db, current_user)
+    return json_response({"count": inbox.unread_count})
+
+@router.put("/read")
+@query_budget(14)
+def mark_many_as_read(
+    request: MarkReadRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if request.ids is None and request.up_to is None:
+        raise HTTPException(status_code=400, detail="Provide ids or up_to")
+
+    inbox = get_inbox(db, current_user, for_update=True)
+    marked = 0
+    if request.up_to is not None:
+        marked += mark_read_up_to(db, inbox, request.up_to)
+    if request.ids:
+        marked += mark_read(db, inbox, request.ids)
+    return {"message": f"{marked} notifications marked as read", "unread_count": inbox.unread_count}
 
 @router.put("/{notification_id}/read")
-async def mark_as_read(notification_id: int, db: Session = Depends(get_db)):
-    notification = db.query(Notification).filter(Notification.id == notification_id).first()
+@query_budget(9)
+def mark_as_read(
+    notification_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    notification = db.query(Notification.id).filter(Notification.id == notification_id).first()
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
-    
-    notification.is_read = True
-    db.commit()
+
+    inbox = get_inbox(db, current_user, for_update=True)
+    mark_read(db, inbox, [notification_id])
     return {"message": "Notification marked as read"}
 
 @router.put("/mark-all-read")
-async def mark_all_as_read(db: Session = Depends(get_db)):
-    db.query(Notification).filter(Notification.is_read == False).update({"is_read": True})
-    db.commit()
+@query_budget(10)
+def mark_all_as_read(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    inbox = get_inbox(db, current_user, for_update=True)
+    mark_read_up_to(db, inbox)
     return {"message": "All notifications marked as read"}
 
 def create_notification(db: Session, type: str, title: str, message: str, priority: str = "medium"):
@@ -60,5 +112,6 @@ def create_notification(db: Session, type: str, title: str, message: str, priori
         priority=priority
     )
     db.add(notification)
+    deliver(db)
     db.commit()
-    return notification
\ No newline at end of file
+    return notification
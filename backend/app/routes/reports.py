@@ -0,0 +1,107 @@
+import json
+import os
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import Literal, Optional
+from datetime import datetime
+from config.database import get_db
+from app.models.report import ReportJob, ReportStatus
+from app.models.user import User
+from app.utils.auth import get_current_user, get_current_username
+from app.utils.query_budget import query_budget
+from app.utils.reports import MEDIA_TYPES, artifact_path, enqueue_report
+from app.utils.responses import json_response
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+class ReportRequest(BaseModel):
+    kind: Literal["analytics", "departments"]
+    timeRange: Literal["7d", "30d", "90d", "1y"] = "30d"
+    format: Literal["json", "csv"] = "json"
+
+class ReportJobResponse(BaseModel):
+    id: int
+    kind: str
+    params: dict
+    format: str
+    status: ReportStatus
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+
+def job_dict(job: ReportJob) -> dict:
+    """ReportJobResponse-shaped dict"""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "params": json.loads(job.params),
+        "format": job.format,
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "download_url": f"/api/reports/{job.id}/download" if job.status == ReportStatus.COMPLETED else None
+    }
+
+def get_job(db: Session, job_id: int) -> ReportJob:
+    job = db.query(ReportJob).filter(ReportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    return job
+
+@router.post("", response_model=ReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+@query_budget(6)
+def create_report(
+    report: ReportRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a report; poll GET /reports/{id} until it completes.
+
+    An identical report that is still pending is returned instead of a new
+    job, and a finished one is returned (200) while the data is unchanged.
+    """
+    job, created = enqueue_report(
+        db, report.kind, {"timeRange": report.timeRange}, report.format, current_user.id
+    )
+    ready = job.status == ReportStatus.COMPLETED
+    return json_response(job_dict(job), status_code=200 if ready and not created else 202)
+
+@router.get("/{job_id}", response_model=ReportJobResponse)
+@query_budget(1)
+def get_report(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_username)
+):
+    return json_response(job_dict(get_job(db, job_id)))
+
+@router.get("/{job_id}/download")
+@query_budget(1)
+def download_report(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_username)
+):
+    job = get_job(db, job_id)
+    if job.status != ReportStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report is {job.status.value}"
+        )
+    path = artifact_path(job)
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report file not found"
+        )
+    filename = f"{job.kind}-{json.loads(job.params)['timeRange']}-{job.id}.{job.format}"
+    return FileResponse(path, media_type=MEDIA_TYPES[job.format], filename=filename)
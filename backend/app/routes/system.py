@@ -0,0 +1,54 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from config.database import pool_stats
+from app.models.user import User
+from app.utils.auth import get_current_user
+from app.utils.password_hashing import password_hasher
+from app.utils.principal_cache import principal_cache
+from app.utils.metrics import statement_cache_stats
+from app.utils.intern_mirror import intern_mirror
+from app.utils.profiling import list_profiles, profile_path
+from app.utils.rate_limit import login_rate_limiter
+from app.utils.query_budget import query_budget
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+def require_admin(current_user: User = Depends(get_current_user)):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
+@router.get("/stats")
+@query_budget(1)
+def get_system_stats(current_user: User = Depends(require_admin)):
+    """Per-worker runtime counters"""
+    return {
+        "db_pool": pool_stats(),
+        "password_hasher": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "login_rate_limiter": login_rate_limiter.stats(),
+        "statement_cache": statement_cache_stats(),
+        "intern_mirror": intern_mirror.stats()
+    }
+
+@router.get("/profiles")
+@query_budget(1)
+def get_profiles(current_user: User = Depends(require_admin)):
+    """Stored request profiles on this host, newest first"""
+    return list_profiles()
+
+@router.get("/profiles/{profile_id}")
+@query_budget(1)
+def download_profile(profile_id: str, current_user: User = Depends(require_admin)):
+    """Collapsed stacks, loadable in speedscope or flamegraph.pl"""
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return FileResponse(path, media_type="text/plain", filename=os.path.basename(path))
@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 from config.database import get_db
+from app.utils.db_routing import get_read_db
 from app.models.task import Task, TaskStatus
 from app.models.intern import Intern
 from app.models.user import User
 from app.utils.auth import get_current_user
+from app.utils.intern_archive import all_interns, all_tasks
+from app.utils.fieldsets import parse_fields
+from app.repositories import reads, lookups
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
 from app.routes.notifications import create_notification
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -36,45 +43,116 @@ class TaskResponse(BaseModel):
     class Config:
         from_attributes = True
 
+TASK_COLUMNS = (Task.id, Task.intern_id, Task.title, Task.description, Task.deadline, Task.status, Task.created_at)
+TASK_FIELDS = tuple(column.key for column in TASK_COLUMNS)
+
+def task_dict(task, fields=None) -> dict:
+    """TaskResponse-shaped dict from a Task or a TASK_COLUMNS row; `fields`
+    limits it to a sparse fieldset"""
+    return {field: getattr(task, field) for field in fields or TASK_FIELDS}
+
+# Orders for paginated task lists (?sort=, "-" prefix for descending); ties
+# break on id. Cursor values are parsed back with these.
+TASK_SORTS = {
+    "id": int,
+    "deadline": datetime.fromisoformat,
+    "status": TaskStatus,
+    "created_at": datetime.fromisoformat
+}
+
+def parse_task_sort(value: str):
+    """(column, descending) for ?sort="""
+    key = value[1:] if value.startswith("-") else value
+    if key not in TASK_SORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sort: {value}; use one of {', '.join(TASK_SORTS)}, optionally prefixed with -"
+        )
+    return key, value.startswith("-")
+
+def task_cursor(row, sort: str, descending: bool) -> str:
+    """Cursor for the page after `row`, the last row of a reads.task_page"""
+    return encode_cursor(("-" if descending else "") + sort, row.sort_value, row.id)
+
+def parse_task_cursor(cursor: str, sort: str, descending: bool):
+    """(sort value, id) from a task_cursor; 400 if it was made for another sort"""
+    made_for, value, last_id = decode_cursor(cursor, 3)
+    if made_for != ("-" if descending else "") + sort:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor is for a different sort")
+    try:
+        return TASK_SORTS[sort](value), int(last_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
 @router.get("/intern/{intern_id}", response_model=List[TaskResponse])
+@query_budget(3)
 def get_intern_tasks(
     intern_id: int,
-    db: Session = Depends(get_db),
+    include_archived: bool = Query(False),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
+    sort: Optional[str] = Query(None, description="id, deadline, status or created_at; prefix - for descending"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    """An intern's tasks: all of them, or one page at a time once sort,
+    cursor or limit is given (X-Next-Cursor is set while more follow)"""
+    field_list = parse_fields(fields, TASK_FIELDS)
+    interns = all_interns().c if include_archived else Intern
+    tasks = all_tasks().c if include_archived else Task
+    
     # Verify intern exists
-    intern = db.query(Intern).filter(Intern.id == intern_id).first()
+    intern = db.query(interns.id).filter(interns.id == intern_id).first()
     if not intern:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Intern not found"
         )
     
-    tasks = db.query(Task).filter(Task.intern_id == intern_id).all()
-    return tasks
+    if sort is None and cursor is None and limit is None:
+        # Only the requested columns are selected
+        columns = [getattr(tasks, field) for field in field_list or TASK_FIELDS]
+        rows = db.query(*columns).filter(tasks.intern_id == intern_id).all()
+        return json_response([task_dict(row, field_list) for row in rows])
+    
+    sort_key, descending = parse_task_sort(sort or "id")
+    after = parse_task_cursor(cursor, sort_key, descending) if cursor else None
+    rows, has_more = reads.task_page(
+        db, intern_id, field_list or TASK_FIELDS, sort_key, descending, after, limit or 50, include_archived
+    )
+    headers = {}
+    if has_more:
+        headers["X-Next-Cursor"] = task_cursor(rows[-1], sort_key, descending)
+    return json_response([task_dict(row, field_list) for row in rows], headers=headers)
 
 @router.get("/{task_id}", response_model=TaskResponse)
+@query_budget(2)
 def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    field_list = parse_fields(fields, TASK_FIELDS)
+    columns = [getattr(Task, field) for field in field_list] if field_list else TASK_COLUMNS
+    task = db.query(*columns).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
-    return task
+    return json_response(task_dict(task, field_list))
 
 @router.post("/", response_model=TaskResponse)
+@query_budget(10)
 def create_task(
     task: TaskCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     # Verify intern exists
-    intern = db.query(Intern).filter(Intern.id == task.intern_id).first()
+    intern = lookups.intern(db, task.intern_id)
     if not intern:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -95,16 +173,17 @@ def create_task(
         priority="medium"
     )
     
-    return db_task
+    return json_response(task_dict(db_task))
 
 @router.put("/{task_id}", response_model=TaskResponse)
+@query_budget(5)
 def update_task(
     task_id: int,
     task_update: TaskUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = lookups.task(db, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,15 +196,16 @@ def update_task(
     
     db.commit()
     db.refresh(task)
-    return task
+    return json_response(task_dict(task))
 
 @router.delete("/{task_id}")
+@query_budget(4)
 def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = lookups.task(db, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2,11 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-import os
-import uuid
 from config.database import get_db
 from app.models.user import User
 from app.utils.auth import get_current_user
+from app.utils.principal_cache import invalidate_principal
+from app.utils.avatars import save_avatar, schedule_thumbnails, thumbnail_filename, thumbnail_sizes, max_upload_bytes
+from app.utils.body_limit import max_body_size
+from app.utils.query_budget import query_budget
+from app.utils.responses import json_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -27,27 +30,33 @@ class UserProfile(BaseModel):
     avatar_url: Optional[str] = None
     is_active: bool
 
+def profile_dict(user: User) -> dict:
+    """UserProfile-shaped dict, serialized by json_response without a model"""
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "phone": getattr(user, 'phone', None),
+        "department": getattr(user, 'department', None),
+        "full_name": getattr(user, 'full_name', None),
+        "avatar_url": getattr(user, 'avatar_url', None),
+        "is_active": user.is_active
+    }
+
 @router.get("/profile", response_model=UserProfile)
+@query_budget(1)
 def get_current_user_profile(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get current user profile"""
     try:
-        return UserProfile(
-            id=current_user.id,
-            username=current_user.username,
-            email=current_user.email,
-            phone=getattr(current_user, 'phone', None),
-            department=getattr(current_user, 'department', None),
-            full_name=getattr(current_user, 'full_name', None),
-            avatar_url=getattr(current_user, 'avatar_url', None),
-            is_active=current_user.is_active
-        )
+        return json_response(profile_dict(current_user))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting profile: {str(e)}")
 
 @router.put("/profile", response_model=UserProfile)
+@query_budget(4)
 def update_user_profile(
     profile_data: UserProfileUpdate,
     db: Session = Depends(get_db),
@@ -76,23 +85,16 @@ def update_user_profile(
                 raise HTTPException(status_code=400, detail="Username already in use")
         
         # Update user fields safely
+        previous_username = current_user.username
         for field, value in update_data.items():
             if hasattr(current_user, field):
                 setattr(current_user, field, value)
         
         db.commit()
+        invalidate_principal(previous_username, current_user.username)
         db.refresh(current_user)
         
-        return UserProfile(
-            id=current_user.id,
-            username=current_user.username,
-            email=current_user.email,
-            phone=getattr(current_user, 'phone', None),
-            department=getattr(current_user, 'department', None),
-            full_name=getattr(current_user, 'full_name', None),
-            avatar_url=getattr(current_user, 'avatar_url', None),
-            is_active=current_user.is_active
-        )
+        return json_response(profile_dict(current_user))
     except HTTPException:
         raise
     except Exception as e:
@@ -100,6 +102,8 @@ def update_user_profile(
         raise HTTPException(status_code=500, detail=f"Error updating profile: {str(e)}")
 
 @router.post("/profile/avatar")
+@query_budget(3)
+@max_body_size(max_upload_bytes())
 def upload_avatar(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -107,36 +111,28 @@ def upload_avatar(
 ):
     """Upload user avatar"""
     try:
-        # Validate file type
-        if not file.content_type.startswith('image/'):
+        # Validate file type (the content itself is checked while streaming)
+        if not file.content_type or not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
-        # Validate file size (2MB max)
-        if file.size and file.size > 2 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size must be less than 2MB")
-        
-        # Create uploads directory if it doesn't exist
-        upload_dir = "uploads/avatars"
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        import uuid
-        file_extension = file.filename.split('.')[-1] if file.filename else 'jpg'
-        filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(upload_dir, filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = file.file.read()
-            buffer.write(content)
+        # Copy to a content-addressed file, checking the image size as we read
+        filename = save_avatar(file)
+        schedule_thumbnails(filename)
         
         # Update user avatar URL
         avatar_url = f"/uploads/avatars/{filename}"
         if hasattr(current_user, 'avatar_url'):
             current_user.avatar_url = avatar_url
             db.commit()
+            invalidate_principal(current_user.username)
         
-        return {"avatar_url": avatar_url}
+        return json_response({
+            "avatar_url": avatar_url,
+            "thumbnails": {
+                str(size): f"/uploads/avatars/{thumbnail_filename(filename, size)}"
+                for size in thumbnail_sizes()
+            }
+        })
     except HTTPException:
         raise
     except Exception as e:
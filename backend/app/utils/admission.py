@@ -0,0 +1,134 @@
+import time
+import anyio
+import anyio.to_thread
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from config.database import settings, worker_threads
+
+# Requests are admitted per route class: "heavy" (aggregations such as
+# analytics) and "default" each get their own slots, "light" (health checks,
+# metrics) is never queued or shed
+ROUTE_CLASSES = ("heavy", "default", "light")
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Requests waiting for an admission slot",
+    ["route_class"], multiprocess_mode="livesum"
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Requests holding an admission slot",
+    ["route_class"], multiprocess_mode="livesum"
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds", "Time requests that found no free slot spent queued", ["route_class"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total", "Requests rejected with 503 instead of queueing",
+    ["route_class", "reason"]
+)
+
+def route_class(name: str):
+    """Declare the endpoint's admission class ("heavy" or "light"); goes below the router decorator"""
+    if name not in ROUTE_CLASSES:
+        raise ValueError(f"Unknown route class: {name}")
+
+    def decorator(endpoint):
+        endpoint.route_class = name
+        return endpoint
+    return decorator
+
+def configure_threadpool():
+    """Size the worker's threadpool, which runs every sync handler and dependency"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = worker_threads()
+
+def admission_limits():
+    """(heavy, default) slots, fitted to the worker's threads with the
+    heavy slots set aside, so admitted requests never wait for a thread"""
+    threads = worker_threads()
+    heavy = min(settings.admission_heavy_limit, threads)
+    return heavy, min(settings.admission_default_limit, max(1, threads - heavy))
+
+def endpoint_for(scope):
+    """The endpoint the router will dispatch this scope to, to read the
+    attributes its decorators declared; None if no route matches"""
+    router = scope["app"].router
+    for route in router.routes:
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return getattr(route, "endpoint", None)
+    return None
+
+def _class_for(scope) -> str:
+    return getattr(endpoint_for(scope), "route_class", "default")
+
+class AdmissionControlMiddleware:
+    """Per-route-class concurrency limits with load shedding (pure ASGI).
+
+    A request waits for a slot of its class for at most
+    ADMISSION_QUEUE_TIMEOUT_MS, and is turned away at once when
+    ADMISSION_MAX_QUEUE requests are already waiting; either way it gets a
+    503 with Retry-After instead of queueing behind slow work.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        heavy, default = admission_limits()
+        self.limits = {
+            "heavy": anyio.Semaphore(heavy),
+            "default": anyio.Semaphore(default)
+        }
+        self.waiting = {name: 0 for name in self.limits}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = _class_for(scope)
+        semaphore = self.limits.get(name)
+        if semaphore is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            semaphore.acquire_nowait()
+        except anyio.WouldBlock:
+            if 0 < settings.admission_max_queue <= self.waiting[name]:
+                await self._shed(name, "queue_full", scope, receive, send)
+                return
+            if not await self._wait(name, semaphore):
+                await self._shed(name, "timeout", scope, receive, send)
+                return
+
+        ADMISSION_IN_FLIGHT.labels(name).inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            semaphore.release()
+            ADMISSION_IN_FLIGHT.labels(name).dec()
+
+    async def _wait(self, name, semaphore) -> bool:
+        """Queue for a slot until the deadline; False if it passed first"""
+        started = time.perf_counter()
+        admitted = False
+        self.waiting[name] += 1
+        ADMISSION_QUEUE_DEPTH.labels(name).inc()
+        try:
+            with anyio.move_on_after(settings.admission_queue_timeout_ms / 1000):
+                await semaphore.acquire()
+                admitted = True
+        finally:
+            self.waiting[name] -= 1
+            ADMISSION_QUEUE_DEPTH.labels(name).dec()
+            ADMISSION_WAIT.labels(name).observe(time.perf_counter() - started)
+        return admitted
+
+    @staticmethod
+    async def _shed(name, reason, scope, receive, send):
+        ADMISSION_SHED.labels(name, reason).inc()
+        response = JSONResponse(
+            status_code=503,
+            content={"detail": "Server is busy, please retry shortly"},
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
+        await response(scope, receive, send)
@@ -1,14 +1,15 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from config.database import get_db, settings
-from app.models.user import User
+from app.repositories import lookups
+from app.utils.principal_cache import principal_cache
+from app.utils.batch import current_batch
+from app.utils.password_hashing import pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -29,6 +30,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    batch = current_batch()
+    if batch is not None and credentials.credentials == batch.token:
+        # Sub-request of POST /api/batch, which already decoded this token
+        return batch.username
     try:
         payload = jwt.decode(credentials.credentials, settings.secret_key, algorithms=[settings.algorithm])
         username: str = payload.get("sub")
@@ -44,11 +49,27 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
             detail="Could not validate credentials"
         )
 
+def get_current_username(username: str = Depends(verify_token)) -> str:
+    """Authenticate from the token alone, for handlers that never touch the User row"""
+    return username
+
 def get_current_user(username: str = Depends(verify_token), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == username).first()
+    batch = current_batch()
+    if batch is not None and batch.username == username:
+        return db.merge(batch.user, load=False)
+
+    if principal_cache.enabled:
+        cached = principal_cache.get(username)
+        if cached is not None:
+            # Attach a copy to this request's session without a SELECT
+            return db.merge(cached, load=False)
+
+    user = lookups.user_by_username(db, username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
+    if principal_cache.enabled:
+        principal_cache.put(username, user)
     return user
\ No newline at end of file
@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, UploadFile
+from starlette.staticfiles import StaticFiles
+from config.database import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Room for the multipart boundaries and part headers around the image
+MULTIPART_OVERHEAD = 16 * 1024
+
+# Accepted formats, checked against the file's magic bytes rather than the
+# client-supplied content type or filename
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+]
+
+_thumbnail_pool = None
+_thumbnail_pool_lock = threading.Lock()
+
+def max_upload_bytes() -> int:
+    """Largest avatar request body; bigger ones are refused before parsing"""
+    return settings.avatar_max_bytes + MULTIPART_OVERHEAD
+
+def avatar_dir() -> str:
+    return os.path.join(settings.upload_dir, "avatars")
+
+def thumbnail_sizes():
+    return [int(size) for size in settings.avatar_thumbnail_sizes.split(",") if size.strip()]
+
+def _sniff_extension(head: bytes):
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+def save_avatar(file: UploadFile) -> str:
+    """Stream an upload to disk in chunks and return its content-addressed filename.
+
+    The request body is already capped at max_upload_bytes() by
+    BodySizeLimitMiddleware; the exact image size is checked here while
+    copying. Identical images map to the same file and are stored once.
+    """
+    directory = avatar_dir()
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    extension = None
+    try:
+        with open(temp_path, "wb") as buffer:
+            while True:
+                chunk = file.file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if extension is None:
+                    extension = _sniff_extension(chunk)
+                    if extension is None:
+                        raise HTTPException(status_code=400, detail="File must be a JPEG, PNG, GIF or WebP image")
+                size += len(chunk)
+                if size > settings.avatar_max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File size must be less than {settings.avatar_max_bytes // (1024 * 1024)}MB"
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+
+        if extension is None:
+            raise HTTPException(status_code=400, detail="File is empty")
+
+        filename = f"{digest.hexdigest()[:32]}.{extension}"
+        final_path = os.path.join(directory, filename)
+        if os.path.exists(final_path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, final_path)
+        return filename
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def thumbnail_filename(filename: str, size: int) -> str:
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}_{size}{extension}"
+
+def _build_thumbnails(filename: str):
+    from PIL import Image
+
+    directory = avatar_dir()
+    try:
+        with Image.open(os.path.join(directory, filename)) as image:
+            image.load()
+            for size in thumbnail_sizes():
+                target = os.path.join(directory, thumbnail_filename(filename, size))
+                if os.path.exists(target):
+                    continue
+                thumbnail = image.copy()
+                thumbnail.thumbnail((size, size))
+                temp_path = f"{target}.{uuid.uuid4().hex}.part"
+                thumbnail.save(temp_path, format=image.format)
+                os.replace(temp_path, target)
+    except Exception:
+        logger.exception("Thumbnail generation failed for %s", filename)
+
+def pillow_available() -> bool:
+    # Imported lazily: Pillow is optional and only needed once an upload arrives
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def schedule_thumbnails(filename: str):
+    """Resize in the background pool; the upload response doesn't wait for it"""
+    global _thumbnail_pool
+    if not pillow_available():
+        return
+    if _thumbnail_pool is None:
+        # Sync handlers run concurrently in the threadpool; create one pool only
+        with _thumbnail_pool_lock:
+            if _thumbnail_pool is None:
+                _thumbnail_pool = ThreadPoolExecutor(
+                    max_workers=settings.avatar_thumbnail_workers,
+                    thread_name_prefix="avatar-thumbnails"
+                )
+    _thumbnail_pool.submit(_build_thumbnails, filename)
+
+def shutdown_thumbnail_pool():
+    if _thumbnail_pool is not None:
+        _thumbnail_pool.shutdown(wait=True)
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files whose names are content hashes, so they can be cached forever"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
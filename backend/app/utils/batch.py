@@ -0,0 +1,128 @@
+import logging
+from contextvars import ContextVar
+from typing import Optional
+import anyio
+import anyio.to_thread
+import orjson
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from starlette.middleware.exceptions import ExceptionMiddleware
+from app.utils.metrics import nested_request_stats
+from app.utils.query_budget import QueryBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+# Headers of the batch request that must not leak into its GET sub-requests
+SKIPPED_HEADERS = {b"content-length", b"content-type", b"transfer-encoding"}
+# Sub-response headers passed back to the client alongside each body
+RETURNED_HEADERS = {b"x-next-cursor"}
+# Scope keys the router fills in per request
+ROUTING_KEYS = {"route", "endpoint", "path_params", "fastapi_astack"}
+
+class BatchContext:
+    """What one lane of a batch shares across its sub-requests: the already
+    authenticated principal and a read session"""
+
+    __slots__ = ("token", "username", "user", "read_session")
+
+    def __init__(self, token: str, username: str, user, read_session):
+        self.token = token
+        self.username = username
+        self.user = user
+        self.read_session = read_session
+
+# Set while a lane runs; copied into the threadpool with each dependency and
+# handler call, so verify_token, get_current_user and get_read_db see it
+_batch_context: ContextVar = ContextVar("batch_context", default=None)
+
+def current_batch() -> Optional[BatchContext]:
+    return _batch_context.get()
+
+_handlers = {}
+
+def _sub_app(app):
+    # The innermost layers of app's own stack: routing, exception handlers
+    # (HTTPException, validation errors) and the exit stack that closes each
+    # sub-request's yield dependencies. User middlewares are not re-run.
+    handler = _handlers.get(id(app))
+    if handler is None:
+        exception_handlers = {
+            key: value for key, value in app.exception_handlers.items() if key not in (500, Exception)
+        }
+        handler = ExceptionMiddleware(AsyncExitStackMiddleware(app.router), handlers=exception_handlers)
+        _handlers[id(app)] = handler
+    return handler
+
+def _item_error(item_id, status_code: int, detail: str) -> dict:
+    return {"id": item_id, "status": status_code, "headers": {}, "body": {"detail": detail}}
+
+async def dispatch(parent_scope, item_id, path: str) -> dict:
+    """Run one GET in-process and return {id, status, headers, body}"""
+    path, _, query_string = path.partition("?")
+    scope = {key: value for key, value in parent_scope.items() if key not in ROUTING_KEYS}
+    scope.update({
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "headers": [(name, value) for name, value in parent_scope["headers"] if name not in SKIPPED_HEADERS]
+    })
+
+    response = {"status": 500, "headers": [], "body": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    try:
+        with nested_request_stats(scope):
+            await _sub_app(scope["app"])(scope, receive, send)
+    except QueryBudgetExceeded:
+        raise
+    except Exception:
+        logger.exception("Batch sub-request GET %s failed", path)
+        return _item_error(item_id, 500, "Internal Server Error")
+
+    body = b"".join(response["body"])
+    headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in response["headers"]}
+    returned = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in response["headers"] if name in RETURNED_HEADERS
+    }
+    if headers.get("content-type", "").startswith("application/json"):
+        content = orjson.loads(body) if body else None
+    else:
+        content = body.decode("utf-8", errors="replace")
+    return {"id": item_id, "status": response["status"], "headers": returned, "body": content}
+
+async def run_batch(scope, items, principal, session_factory, lanes: int) -> list:
+    """Dispatch (id, path) items across up to `lanes` concurrent lanes.
+
+    A Session is not thread-safe, so each lane opens one read session and
+    runs its share of the items on it in order; items keep their positions
+    in the returned list.
+    """
+    results = [None] * len(items)
+    token, username, user = principal
+
+    async def run_lane(positions):
+        session = session_factory()
+        context = _batch_context.set(BatchContext(token, username, user, session))
+        try:
+            for position in positions:
+                item_id, path = items[position]
+                results[position] = await dispatch(scope, item_id, path)
+        finally:
+            _batch_context.reset(context)
+            await anyio.to_thread.run_sync(session.close)
+
+    lanes = max(1, min(lanes, len(items)))
+    async with anyio.create_task_group() as task_group:
+        for lane in range(lanes):
+            task_group.start_soon(run_lane, range(lane, len(items), lanes))
+    return results
@@ -0,0 +1,52 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from app.utils.admission import endpoint_for
+
+def max_body_size(max_bytes: int):
+    """Declare the largest request body the endpoint accepts; goes below the router decorator"""
+    def decorator(endpoint):
+        endpoint.max_body_size = max_bytes
+        return endpoint
+    return decorator
+
+def _too_large(max_bytes: int) -> dict:
+    return {"detail": f"Request body must be less than {max_bytes // (1024 * 1024)}MB"}
+
+class BodySizeLimitMiddleware:
+    """Rejects bodies over an endpoint's max_body_size with 413 (pure ASGI).
+
+    Runs before the body is parsed: a declared Content-Length over the limit
+    is refused without reading, and an undeclared (chunked) body is counted
+    as it arrives and cut off past the limit, so the multipart parser never
+    spools more than that to disk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = None
+        if scope["type"] == "http":
+            max_bytes = getattr(endpoint_for(scope), "max_body_size", None)
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > max_bytes:
+                await JSONResponse(status_code=413, content=_too_large(max_bytes))(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # An HTTPException passes through FastAPI's body parsing as is
+                    raise HTTPException(status_code=413, detail=_too_large(max_bytes)["detail"])
+            return message
+
+        await self.app(scope, limited_receive, send)
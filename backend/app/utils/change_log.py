@@ -0,0 +1,36 @@
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from app.models.change_log import ChangeLog
+from app.models.intern import Intern
+from app.models.task import Task
+from app.models.notification import Notification
+
+# Entities in the change feed, by model
+TRACKED = {Intern: "intern", Task: "task", Notification: "notification"}
+
+def record_changes(db: Session, entity: str, ids, op: str):
+    """Log writes made with Core statements, which the flush hook can't see.
+
+    Call it in the same transaction as the write.
+    """
+    if ids:
+        db.execute(insert(ChangeLog), [{"entity": entity, "entity_id": i, "op": op} for i in ids])
+
+def _after_flush(session, flush_context):
+    # Runs inside the flush's transaction, so log rows commit (or roll back)
+    # with the writes they describe. Primary keys are assigned by now.
+    rows = []
+    for op, objects in (("create", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            entity = TRACKED.get(type(obj))
+            if entity is None:
+                continue
+            if op == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            rows.append({"entity": entity, "entity_id": obj.id, "op": op})
+    if rows:
+        session.connection().execute(insert(ChangeLog), rows)
+
+def install_change_log(session_factory):
+    """Log ORM writes to tracked entities made through sessions of this factory"""
+    event.listen(session_factory, "after_flush", _after_flush)
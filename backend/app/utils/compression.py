@@ -0,0 +1,155 @@
+import zlib
+from config.database import settings
+
+# Optional: brotli is used when installed and the client accepts it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def compressible_types():
+    return {value.strip() for value in settings.compression_types.split(",") if value.strip()}
+
+def choose_encoding(accept_encoding: str):
+    """Pick br or gzip from an Accept-Encoding header, or None"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+class _Gzip:
+    def __init__(self):
+        self._compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so each streamed chunk reaches the client promptly
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+class _Brotli:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+def _compressor(encoding: str):
+    return _Brotli() if encoding == "br" else _Gzip()
+
+class CompressionMiddleware:
+    """gzip/brotli for text payloads (pure ASGI).
+
+    Only allowlisted content types at least COMPRESSION_MIN_SIZE bytes long
+    are compressed; responses that already carry a Content-Encoding, range
+    responses, and everything else (images such as avatars), pass through
+    untouched. Streaming responses are compressed chunk by chunk, and a
+    strong ETag on a compressed response is weakened.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = choose_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = not self._should_compress(message)
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < settings.compression_min_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _compressor(encoding)
+                headers = [
+                    (k, self._weak_etag(v) if k == b"etag" else v)
+                    for k, v in start["headers"] if k not in (b"content-length", b"vary")
+                ]
+                headers += [(b"content-encoding", encoding.encode()), (b"vary", self._vary(start["headers"]))]
+                if not more_body:
+                    body = compressor.finish(body)
+                    headers.append((b"content-length", str(len(body)).encode()))
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start, "headers": headers})
+
+            data = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _should_compress(start) -> bool:
+        # 206 bodies are byte ranges of the uncompressed representation
+        if start["status"] < 200 or start["status"] in (204, 206, 304):
+            return False
+        content_type = b""
+        for name, value in start.get("headers", []):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+            if name == b"content-length" and int(value) < settings.compression_min_size:
+                return False
+        media_type = content_type.decode("latin-1").split(";")[0].strip().lower()
+        return media_type in compressible_types()
+
+    @staticmethod
+    def _weak_etag(value: bytes) -> bytes:
+        # A strong ETag names exact bytes; the compressed body is a different
+        # representation, so only a weak validator still holds for it
+        return value if value.startswith(b"W/") else b"W/" + value
+
+    @staticmethod
+    def _vary(headers) -> bytes:
+        for name, value in headers:
+            if name == b"vary" and b"accept-encoding" not in value.lower():
+                return value + b", Accept-Encoding"
+            if name == b"vary":
+                return value
+        return b"Accept-Encoding"
@@ -0,0 +1,89 @@
+import hashlib
+import random
+import time
+from fastapi import Request
+from config.database import SessionLocal, ReadSessionLocal, engine, read_engine, settings
+from app.utils.worker_signals import touch_signal, signal_time, prune_signals
+from app.utils.batch import current_batch
+from app.utils.admission import endpoint_for
+
+PIN_PREFIX = "rw-"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+def has_read_replica() -> bool:
+    return read_engine is not engine
+
+def _pin_name(authorization: str) -> str:
+    # Keyed by the bearer token so no JWT decode or user lookup is needed
+    return PIN_PREFIX + hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+def read_only(endpoint):
+    """Mark a non-GET endpoint that writes nothing (e.g. POST /api/batch), so
+    it does not pin the client to the primary; goes below the router decorator"""
+    endpoint.read_only = True
+    return endpoint
+
+def pin_to_primary(authorization: str):
+    """Send this client's reads to the primary for the read-your-writes window"""
+    touch_signal(_pin_name(authorization))
+    if random.random() < 0.01:
+        prune_signals(PIN_PREFIX, settings.read_your_writes_seconds * 2)
+
+def pinned_to_primary(request: Request) -> bool:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return False
+    pinned_at = signal_time(_pin_name(authorization))
+    return time.time_ns() - pinned_at < settings.read_your_writes_seconds * 1e9
+
+def read_sessionmaker(request: Request):
+    """The replica's sessionmaker, unless this client just wrote"""
+    if has_read_replica() and not pinned_to_primary(request):
+        return ReadSessionLocal
+    return SessionLocal
+
+def get_read_db(request: Request):
+    """Session for read-only handlers: the replica, unless this client just wrote"""
+    batch = current_batch()
+    if batch is not None:
+        # Sub-request of POST /api/batch: its lane owns and closes the session
+        yield batch.read_session
+        return
+    db = read_sessionmaker(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+class ReadYourWritesMiddleware:
+    """Pins a client to the primary (and past the intern mirror) as soon as
+    one of its writes succeeds. Endpoints marked @read_only never pin.
+
+    The pin is recorded when the response starts, before the client can
+    see it and issue a follow-up read to another worker.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not (
+            has_read_replica() or settings.intern_mirror_enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+        if getattr(endpoint_for(scope), "read_only", False):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and authorization and message["status"] < 400:
+                pin_to_primary(authorization)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
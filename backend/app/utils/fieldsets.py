@@ -0,0 +1,32 @@
+from typing import Optional, Sequence
+from fastapi import HTTPException, status
+
+def _split(value: str):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def parse_fields(value: Optional[str], allowed: Sequence[str]):
+    """Fields requested with ?fields=a,b in `allowed` order, always with id;
+    None when the parameter is absent (all fields)"""
+    if value is None:
+        return None
+    requested = set(_split(value))
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return [field for field in allowed if field == "id" or field in requested]
+
+def parse_include(value: Optional[str], allowed: Sequence[str]) -> set:
+    """Expansions requested with ?include=a,b"""
+    if value is None:
+        return set()
+    requested = set(_split(value))
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    return requested
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, delete, literal, union_all
+from sqlalchemy.orm import Session
+from config.database import settings
+from app.models.intern import Intern, InternStatus
+from app.models.task import Task
+from app.models.archive import InternArchive, TaskArchive
+from app.utils.change_log import record_changes
+
+INTERN_COLUMNS = [column.name for column in Intern.__table__.columns]
+TASK_COLUMNS = [column.name for column in Task.__table__.columns]
+
+def _columns(model, names):
+    return [getattr(model, name) for name in names]
+
+def all_interns():
+    """Hot and archived interns as one subquery with the interns columns plus `archived`"""
+    return union_all(
+        select(*_columns(Intern, INTERN_COLUMNS), literal(False).label("archived")),
+        select(*_columns(InternArchive, INTERN_COLUMNS), literal(True).label("archived"))
+    ).subquery("all_interns")
+
+def all_tasks():
+    """Hot and archived tasks as one subquery with the tasks columns"""
+    return union_all(
+        select(*_columns(Task, TASK_COLUMNS)),
+        select(*_columns(TaskArchive, TASK_COLUMNS))
+    ).subquery("all_tasks")
+
+def _move(db: Session, ids, sources, targets, op: str):
+    # Copy interns and their tasks to the target tables, then delete the
+    # originals (tasks first), all in the caller's transaction, and log the
+    # move in the change feed as `op`. Returns the number of tasks moved.
+    source_intern, source_task = sources
+    target_intern, target_task = targets
+    task_ids = db.execute(select(source_task.id).where(source_task.intern_id.in_(ids))).scalars().all()
+    db.execute(insert(target_intern).from_select(
+        INTERN_COLUMNS, select(*_columns(source_intern, INTERN_COLUMNS)).where(source_intern.id.in_(ids))
+    ))
+    db.execute(insert(target_task).from_select(
+        TASK_COLUMNS, select(*_columns(source_task, TASK_COLUMNS)).where(source_task.intern_id.in_(ids))
+    ))
+    db.execute(delete(source_task).where(source_task.intern_id.in_(ids)))
+    db.execute(delete(source_intern).where(source_intern.id.in_(ids)))
+    record_changes(db, "intern", ids, op)
+    record_changes(db, "task", task_ids, op)
+    return len(task_ids)
+
+def archive_inactive_interns(db: Session, now: datetime = None, batch_size: int = None, days: int = None) -> dict:
+    """Move interns INACTIVE and untouched for `days` (ARCHIVE_INACTIVE_DAYS),
+    with all their tasks, to the archive tables.
+
+    Each batch commits on its own so no statement holds locks on the hot
+    tables for long. Returns the number of interns and tasks moved.
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.archive_batch_size
+    days = settings.archive_inactive_days if days is None else days
+    cutoff = now - timedelta(days=days)
+
+    moved = {"interns": 0, "tasks": 0}
+    while True:
+        ids = db.execute(
+            select(Intern.id).where(
+                Intern.status == InternStatus.INACTIVE,
+                Intern.updated_at < cutoff
+            ).order_by(Intern.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        moved["tasks"] += _move(db, ids, (Intern, Task), (InternArchive, TaskArchive), "delete")
+        db.commit()
+
+        moved["interns"] += len(ids)
+        if len(ids) < batch_size:
+            break
+    return moved
+
+def restore_interns(db: Session, ids) -> int:
+    """Move archived interns and their tasks back to the hot tables.
+
+    Returns how many were restored; ids that aren't archived are ignored.
+    Raises IntegrityError (after rolling back) if an id or email has been
+    reused by a hot intern since archiving.
+    """
+    ids = db.execute(select(InternArchive.id).where(InternArchive.id.in_(ids))).scalars().all()
+    if not ids:
+        return 0
+    try:
+        _move(db, ids, (InternArchive, TaskArchive), (Intern, Task), "create")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(ids)
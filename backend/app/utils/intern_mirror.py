@@ -0,0 +1,218 @@
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import Request
+from prometheus_client import Counter, Gauge
+from sqlalchemy import select, func
+from config.database import engine, settings
+from app.models.change_log import ChangeLog
+from app.models.intern import Intern, InternStatus
+from app.utils.db_routing import pinned_to_primary
+
+logger = logging.getLogger(__name__)
+
+# The directory: what list, search and filter reads need about an intern
+DIRECTORY_FIELDS = ("id", "full_name", "email", "department", "status", "skills")
+
+INTERN_MIRROR_BYTES = Gauge(
+    "intern_mirror_bytes", "Approximate memory held by the intern directory mirrors",
+    multiprocess_mode="livesum"
+)
+INTERN_MIRROR_STALENESS = Gauge(
+    "intern_mirror_staleness_seconds", "Time since a worker's mirror last caught up with the change log",
+    multiprocess_mode="livemax"
+)
+INTERN_MIRROR_READS = Counter(
+    "intern_mirror_reads_total", "Directory reads by where they were answered",
+    ["outcome"]  # hit, stale (fell back to the database), pinned (client just wrote)
+)
+
+class DirectoryEntry:
+    __slots__ = DIRECTORY_FIELDS
+
+    def __init__(self, id, full_name, email, department, status, skills):
+        self.id = id
+        self.full_name = full_name
+        self.email = email
+        # Departments repeat across interns, so share one string per name
+        self.department = sys.intern(department)
+        self.status = status
+        self.skills = skills
+
+class _Snapshot:
+    """One immutable version of the directory; replaced whole on change, so
+    readers never lock"""
+
+    __slots__ = ("entries", "ids", "nbytes")
+
+    def __init__(self, entries: dict):
+        self.entries = entries
+        self.ids = sorted(entries)
+        self.nbytes = sys.getsizeof(entries) + sys.getsizeof(self.ids) + sum(
+            sys.getsizeof(entry) + sys.getsizeof(entry.full_name) + sys.getsizeof(entry.email)
+            + (sys.getsizeof(entry.skills) if entry.skills else 0)
+            for entry in entries.values()
+        ) + sum(sys.getsizeof(name) for name in {entry.department for entry in entries.values()})
+
+def _select_directory():
+    return select(*[getattr(Intern, field) for field in DIRECTORY_FIELDS])
+
+class InternMirror:
+    """Per-worker in-memory copy of the intern directory.
+
+    Loaded at startup, then kept current by a thread that tails the change
+    log every INTERN_MIRROR_REFRESH_MS. Changed interns are re-read as a
+    whole, so applying a change twice is harmless; the cursor only moves
+    past entries older than CHANGE_FEED_SETTLE_MS, so a transaction that
+    commits late is still picked up. Reads fall back to the database when
+    the mirror is more than INTERN_MIRROR_MAX_STALENESS_MS behind, and for
+    clients inside their read-your-writes window.
+    """
+
+    def __init__(self):
+        self._snapshot = _Snapshot({})
+        self._cursor = 0
+        self._synced_at = None  # monotonic time of the last successful catch-up
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._synced_at is not None
+
+    def staleness(self) -> Optional[float]:
+        return None if self._synced_at is None else time.monotonic() - self._synced_at
+
+    def fresh(self) -> bool:
+        staleness = self.staleness()
+        return staleness is not None and staleness * 1000 <= settings.intern_mirror_max_staleness_ms
+
+    def load(self):
+        """Read the whole directory and the change log position it reflects"""
+        started = time.monotonic()
+        with engine.connect() as connection:
+            cursor = self._settled_cursor(connection)
+            rows = connection.execute(_select_directory()).all()
+        self._cursor = cursor
+        self._publish({row.id: DirectoryEntry(*row) for row in rows})
+        self._synced_at = started
+
+    def sync(self):
+        """Apply intern changes logged since the cursor"""
+        started = time.monotonic()
+        settled = datetime.utcnow() - timedelta(milliseconds=settings.change_feed_settle_ms)
+        with engine.connect() as connection:
+            changes = connection.execute(
+                select(ChangeLog.seq, ChangeLog.entity_id, ChangeLog.changed_at).where(
+                    ChangeLog.seq > self._cursor, ChangeLog.entity == "intern"
+                ).order_by(ChangeLog.seq)
+            ).all()
+            if changes:
+                ids = {change.entity_id for change in changes}
+                rows = connection.execute(_select_directory().where(Intern.id.in_(ids))).all()
+                entries = dict(self._snapshot.entries)
+                for intern_id in ids:
+                    entries.pop(intern_id, None)
+                for row in rows:
+                    entries[row.id] = DirectoryEntry(*row)
+                self._publish(entries)
+                for change in changes:
+                    if change.changed_at >= settled:
+                        break
+                    self._cursor = change.seq
+        self._synced_at = started
+
+    def _settled_cursor(self, connection) -> int:
+        settled = datetime.utcnow() - timedelta(milliseconds=settings.change_feed_settle_ms)
+        return connection.execute(
+            select(func.max(ChangeLog.seq)).where(ChangeLog.changed_at < settled)
+        ).scalar() or 0
+
+    def _publish(self, entries: dict):
+        self._snapshot = _Snapshot(entries)
+        INTERN_MIRROR_BYTES.set(self._snapshot.nbytes)
+
+    def start(self):
+        """Load now and keep refreshing in the background (once per worker)"""
+        self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="intern-mirror", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(settings.intern_mirror_refresh_ms / 1000):
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Intern mirror refresh failed; reads fall back to the database")
+            INTERN_MIRROR_STALENESS.set(self.staleness() or 0)
+
+    # Reads, answered from one snapshot each
+
+    def get(self, intern_id: int) -> Optional[DirectoryEntry]:
+        return self._snapshot.entries.get(intern_id)
+
+    def page(self, offset: int, limit: int, search: Optional[str] = None, department: Optional[str] = None):
+        """(total, entries) like reads.intern_page, in id order"""
+        snapshot = self._snapshot
+        entries = (snapshot.entries[intern_id] for intern_id in snapshot.ids)
+        if department:
+            entries = (entry for entry in entries if entry.department == department)
+        if search:
+            needle = search.lower()
+            entries = (
+                entry for entry in entries
+                if needle in entry.full_name.lower() or needle in entry.email.lower()
+            )
+        matched = list(entries)
+        return len(matched), matched[offset:offset + limit]
+
+    def counts(self):
+        """(total, active) interns"""
+        entries = self._snapshot.entries
+        return len(entries), sum(1 for entry in entries.values() if entry.status == InternStatus.ACTIVE)
+
+    def department_counts(self) -> list:
+        """(department, intern_count) rows, by department"""
+        counts = {}
+        for entry in self._snapshot.entries.values():
+            counts[entry.department] = counts.get(entry.department, 0) + 1
+        return sorted(counts.items())
+
+    def stats(self) -> dict:
+        staleness = self.staleness()
+        return {
+            "enabled": settings.intern_mirror_enabled,
+            "entries": len(self._snapshot.entries),
+            "bytes": self._snapshot.nbytes,
+            "cursor": self._cursor,
+            "staleness_seconds": round(staleness, 3) if staleness is not None else None
+        }
+
+intern_mirror = InternMirror()
+
+def intern_directory(request: Request) -> Optional[InternMirror]:
+    """The mirror if it may answer this request, else None (use the database)"""
+    if not settings.intern_mirror_enabled:
+        return None
+    if pinned_to_primary(request):
+        INTERN_MIRROR_READS.labels("pinned").inc()
+        return None
+    if not intern_mirror.fresh():
+        INTERN_MIRROR_READS.labels("stale").inc()
+        return None
+    INTERN_MIRROR_READS.labels("hit").inc()
+    return intern_mirror
+
+def directory_fields(fields) -> bool:
+    """Whether a sparse fieldset can be served from the directory"""
+    return fields is not None and all(field in DIRECTORY_FIELDS for field in fields)
@@ -0,0 +1,226 @@
+import logging
+import os
+import re
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine.default import CacheStats
+from config.database import MeteredQueuePool, settings
+
+logger = logging.getLogger(__name__)
+
+# With PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py does this) every worker
+# writes its samples to files there and /metrics sums them across workers
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route template",
+    ["method", "route", "status"]
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request",
+    ["route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ["route"])
+DB_TIME = Counter("db_query_seconds_total", "Cumulative time spent in SQL statements", ["route"])
+DB_SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS", ["route"])
+POOL_SIZE = Gauge("db_pool_size", "Pooled connections per engine", ["engine"], multiprocess_mode="livesum")
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections in use", ["engine"], multiprocess_mode="livesum")
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10)
+)
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up waiting for a connection")
+STATEMENT_CACHE = Counter(
+    "db_statement_cache_total", "SQL statements by SQLAlchemy compiled-cache outcome", ["outcome"]
+)
+
+# hit: compiled form reused; miss: compiled and cached; uncached: no cache
+# key (driver-level SQL) or caching disabled
+_CACHE_OUTCOMES = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+    CacheStats.CACHING_DISABLED: "uncached",
+    CacheStats.NO_CACHE_KEY: "uncached",
+    CacheStats.NO_DIALECT_SUPPORT: "uncached",
+}
+# Per-worker totals for /api/system/stats; the counter children are bound
+# once to keep the per-statement cost low
+_statement_cache = {outcome: 0 for outcome in set(_CACHE_OUTCOMES.values())}
+_statement_cache_counters = {outcome: STATEMENT_CACHE.labels(outcome) for outcome in _statement_cache}
+
+NO_ROUTE = "none"
+
+_instrumented_engines = []
+
+class RequestStats:
+    __slots__ = ("scope", "queries", "db_time", "statements", "flagged")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = StatementCounter()  # executions per SQL string (query budgets)
+        self.flagged = set()
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the (shared) scope before
+        # calling the endpoint, so queries are attributed to its template
+        return _route_template(self.scope)
+
+# Mutable per-request accumulator; the context is copied into threadpool
+# calls, so sync handlers add to the same object
+_request_stats: ContextVar = ContextVar("request_stats", default=None)
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|:\w+|\$\d+"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+def normalize_sql(statement: str) -> str:
+    """Collapse literals, bind parameters and IN-lists so similar statements group together"""
+    for pattern, replacement in _LITERALS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+def current_request_stats():
+    return _request_stats.get()
+
+@contextmanager
+def nested_request_stats(scope):
+    """Count an in-process sub-request (see app/utils/batch.py) against its own
+    route and budget, then add its SQL work to the enclosing request"""
+    parent = _request_stats.get()
+    stats = RequestStats(scope)
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+        REQUEST_QUERIES.labels(stats.route).observe(stats.queries)
+        if parent is not None:
+            parent.queries += stats.queries
+            parent.db_time += stats.db_time
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _request_stats.get()
+    route = NO_ROUTE
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+        route = stats.route
+    DB_QUERIES.labels(route).inc()
+    DB_TIME.labels(route).inc(elapsed)
+    outcome = _CACHE_OUTCOMES.get(getattr(context, "cache_hit", None), "uncached")
+    _statement_cache[outcome] += 1
+    _statement_cache_counters[outcome].inc()
+    if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+        DB_SLOW_QUERIES.labels(route).inc()
+        logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, normalize_sql(statement))
+
+def _observe_pool_wait(waited: float, timed_out: bool):
+    POOL_WAIT.observe(waited)
+    if timed_out:
+        POOL_TIMEOUTS.inc()
+
+def instrument_engine(engine, name: str):
+    """Attach query timing and pool gauges to an engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    checked_out = POOL_CHECKED_OUT.labels(name)
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+    if _observe_pool_wait not in MeteredQueuePool.wait_observers:
+        MeteredQueuePool.wait_observers.append(_observe_pool_wait)
+    _instrumented_engines.append((name, engine))
+
+def publish_pool_sizes():
+    # Called from each worker's startup: in multiprocess mode a gauge set in
+    # the gunicorn master would be counted as one more live process
+    for name, engine in _instrumented_engines:
+        if isinstance(engine.pool, MeteredQueuePool):
+            POOL_SIZE.labels(name).set(engine.pool.size())
+
+def statement_cache_stats() -> dict:
+    """This worker's compiled-cache outcomes and each engine's cache fill"""
+    hits, misses = _statement_cache["hit"], _statement_cache["miss"]
+    return {
+        **_statement_cache,
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "cached": {
+            name: len(engine._compiled_cache) if engine._compiled_cache is not None else 0
+            for name, engine in _instrumented_engines
+        }
+    }
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return "unmatched"
+
+class MetricsMiddleware:
+    """Records latency and SQL work per route template (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = stats.route
+            REQUEST_LATENCY.labels(scope["method"], route, str(status_code)).observe(elapsed)
+            REQUEST_QUERIES.labels(route).observe(stats.queries)
+            _request_stats.reset(token)
+
+def render_metrics():
+    """Return (body, content_type) for the /metrics endpoint"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def mark_worker_dead(pid: int):
+    """Called by the gunicorn master when a worker exits"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
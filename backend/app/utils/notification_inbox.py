@@ -0,0 +1,136 @@
+from sqlalchemy import select, update, delete, insert, func, and_, exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.notification import Notification, NotificationInbox, NotificationReceipt
+from app.models.user import User
+
+def get_inbox(db: Session, user: User, for_update: bool = False) -> NotificationInbox:
+    """Load the user's inbox, creating it at the current head of the feed"""
+    query = db.query(NotificationInbox).filter(NotificationInbox.user_id == user.id)
+    if for_update:
+        query = query.with_for_update()
+    inbox = query.first()
+    if inbox:
+        return inbox
+
+    head = db.query(func.max(Notification.id)).scalar() or 0
+    inbox = NotificationInbox(user_id=user.id, last_read_id=head, unread_count=0)
+    db.add(inbox)
+    try:
+        db.flush()
+    except IntegrityError:
+        # Another request created it first
+        db.rollback()
+        return get_inbox(db, user, for_update)
+    settle_read_flags(db, up_to=head)
+    db.commit()
+    return inbox
+
+def deliver(db: Session):
+    """Count a newly added notification as unread for every inbox"""
+    db.execute(
+        update(NotificationInbox)
+        .values(unread_count=NotificationInbox.unread_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def read_ids(db: Session, inbox: NotificationInbox, notification_ids):
+    """Return which of the given notifications the inbox owner has read"""
+    above = [i for i in notification_ids if i > inbox.last_read_id]
+    read = {i for i in notification_ids if i <= inbox.last_read_id}
+    if above:
+        read.update(db.execute(
+            select(NotificationReceipt.notification_id).where(
+                NotificationReceipt.user_id == inbox.user_id,
+                NotificationReceipt.notification_id.in_(above)
+            )
+        ).scalars())
+    return read
+
+def mark_read(db: Session, inbox: NotificationInbox, notification_ids):
+    """Record reads for a list of notification ids; returns how many were newly read"""
+    candidates = {i for i in notification_ids if i > inbox.last_read_id}
+    if not candidates:
+        return 0
+
+    existing = set(db.execute(
+        select(Notification.id).where(Notification.id.in_(candidates))
+    ).scalars())
+    new_ids = sorted(existing - read_ids(db, inbox, existing))
+    if not new_ids:
+        return 0
+
+    db.execute(insert(NotificationReceipt), [
+        {"user_id": inbox.user_id, "notification_id": i} for i in new_ids
+    ])
+    inbox.unread_count = count_unread(db, inbox)
+    settle_read_flags(db, ids=new_ids)
+    db.commit()
+    return len(new_ids)
+
+def mark_read_up_to(db: Session, inbox: NotificationInbox, watermark: int = None):
+    """Advance the read watermark (defaults to, and is capped at, the newest
+    notification: a watermark past it would hide later notifications that
+    deliver() still counts as unread)"""
+    head = db.query(func.max(Notification.id)).scalar() or 0
+    if watermark is None or watermark > head:
+        watermark = head
+    if inbox.last_read_id > head:
+        # Uncapped watermarks stored earlier; nothing exists above the head
+        inbox.last_read_id = head
+        inbox.unread_count = 0
+        db.commit()
+    if watermark <= inbox.last_read_id:
+        return 0
+
+    in_range = and_(Notification.id > inbox.last_read_id, Notification.id <= watermark)
+    total = db.query(func.count()).select_from(Notification).filter(in_range).scalar()
+    receipt_range = and_(
+        NotificationReceipt.user_id == inbox.user_id,
+        NotificationReceipt.notification_id > inbox.last_read_id,
+        NotificationReceipt.notification_id <= watermark
+    )
+    already_read = db.query(func.count()).select_from(NotificationReceipt).filter(receipt_range).scalar()
+
+    # Receipts below the watermark are implied by it
+    db.execute(delete(NotificationReceipt).where(receipt_range))
+    inbox.last_read_id = watermark
+    db.flush()
+    inbox.unread_count = count_unread(db, inbox)
+    settle_read_flags(db, up_to=watermark)
+    db.commit()
+    return total - already_read
+
+def count_unread(db: Session, inbox: NotificationInbox) -> int:
+    """Notifications above the watermark without a receipt, counted afresh"""
+    receipt = exists().where(
+        NotificationReceipt.user_id == inbox.user_id,
+        NotificationReceipt.notification_id == Notification.id
+    )
+    return db.execute(
+        select(func.count()).select_from(Notification).where(
+            Notification.id > inbox.last_read_id, ~receipt
+        )
+    ).scalar()
+
+def settle_read_flags(db: Session, ids=None, up_to: int = None):
+    """Flag notifications read by every inbox as is_read so retention can reclaim them"""
+    receipt = exists().where(
+        NotificationReceipt.user_id == NotificationInbox.user_id,
+        NotificationReceipt.notification_id == Notification.id
+    ).correlate_except(NotificationReceipt)
+    unread_somewhere = exists().where(
+        NotificationInbox.last_read_id < Notification.id,
+        ~receipt
+    ).correlate_except(NotificationInbox)
+    criteria = [Notification.is_read == False, ~unread_somewhere]
+    if ids is not None:
+        criteria.append(Notification.id.in_(ids))
+    if up_to is not None:
+        criteria.append(Notification.id <= up_to)
+    db.execute(
+        update(Notification)
+        .where(*criteria)
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
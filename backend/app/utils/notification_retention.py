@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, delete, and_, not_
+from sqlalchemy.orm import Session
+from config.database import settings
+from app.models.notification import Notification, NotificationArchive, NotificationReceipt
+from app.utils.change_log import record_changes
+
+ARCHIVE_COLUMNS = ["id", "type", "title", "message", "is_read", "created_at", "priority"]
+
+def parse_ttl_rules(spec: str):
+    """Parse 'type:x=14,priority:high=90' into ({type: days}, {priority: days})"""
+    type_ttls, priority_ttls = {}, {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        key, _, days = item.partition("=")
+        kind, _, name = key.strip().partition(":")
+        if kind == "type":
+            type_ttls[name] = int(days)
+        elif kind == "priority":
+            priority_ttls[name] = int(days)
+        else:
+            raise ValueError(f"Invalid notification TTL rule: {item}")
+    return type_ttls, priority_ttls
+
+def retention_rules(now: datetime = None):
+    """Build (label, filter) pairs selecting expired read notifications.
+
+    A notification is read once every user inbox has read it (is_read).
+    Type rules win over priority rules, which win over the default TTL, so
+    every notification falls under exactly one rule.
+    """
+    now = now or datetime.utcnow()
+    type_ttls, priority_ttls = parse_ttl_rules(settings.notification_retention_ttls)
+    rules = []
+
+    def add(label, days, *criteria):
+        if days and days > 0:
+            rules.append((label, and_(
+                Notification.is_read == True,
+                Notification.created_at < now - timedelta(days=days),
+                *criteria
+            )))
+
+    for type_name, days in type_ttls.items():
+        add(f"type:{type_name}", days, Notification.type == type_name)
+
+    untyped = not_(Notification.type.in_(type_ttls)) if type_ttls else True
+    for priority, days in priority_ttls.items():
+        add(f"priority:{priority}", days, untyped, Notification.priority == priority)
+
+    add(
+        "default",
+        settings.notification_retention_days,
+        untyped,
+        not_(Notification.priority.in_(priority_ttls)) if priority_ttls else True
+    )
+    return rules
+
+def purge_read_notifications(db: Session, now: datetime = None, batch_size: int = None, archive: bool = None):
+    """Delete or archive expired read notifications in short transactions.
+
+    Each batch commits on its own so no single statement holds locks on the
+    hot table for long. Returns the number of rows removed per rule.
+    """
+    batch_size = batch_size or settings.notification_retention_batch_size
+    if archive is None:
+        archive = settings.notification_retention_mode == "archive"
+
+    removed = {}
+    for label, criteria in retention_rules(now):
+        removed[label] = 0
+        while True:
+            ids = db.execute(
+                select(Notification.id).where(criteria).order_by(Notification.id).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+
+            if archive:
+                columns = [getattr(Notification, name) for name in ARCHIVE_COLUMNS]
+                db.execute(
+                    insert(NotificationArchive).from_select(
+                        ARCHIVE_COLUMNS,
+                        select(*columns).where(Notification.id.in_(ids))
+                    )
+                )
+            db.execute(delete(NotificationReceipt).where(NotificationReceipt.notification_id.in_(ids)))
+            db.execute(delete(Notification).where(Notification.id.in_(ids)))
+            record_changes(db, "notification", ids, "delete")
+            db.commit()
+
+            removed[label] += len(ids)
+            if len(ids) < batch_size:
+                break
+    return removed
+
+def ensure_notification_indexes(engine):
+    """Create notification indexes missing from tables built before they existed"""
+    for index in Notification.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
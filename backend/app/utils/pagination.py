@@ -0,0 +1,17 @@
+import base64
+import orjson
+from fastapi import HTTPException, status
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor holding JSON-encodable values (datetimes as ISO 8601, enums as values)"""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, length: int) -> list:
+    """The values of a cursor from encode_cursor; 400 if it isn't one"""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != length:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
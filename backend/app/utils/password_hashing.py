@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from config.database import settings
+
+# Kept free of app imports: spawned hashing processes import this module
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+def _verify_and_update(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password[:72], hashed_password)
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password[:72])
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop with a bounded number of jobs in flight.
+
+    bcrypt holds a core for hundreds of milliseconds, so a login burst on
+    the request threads starves everything else in the worker. Jobs beyond
+    the concurrency cap wait here (counted as queued); past max_queue the
+    request is turned away with a 503 instead of piling up.
+    """
+
+    def __init__(self, workers: int, concurrency: int, max_queue: int):
+        self.workers = workers
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max_queue
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._executor = None
+
+    def _get_executor(self):
+        # Created on first use so gunicorn forks workers before any pool exists
+        if self._executor is None and self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in attempts in progress, try again shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        self.queued += 1
+        started = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        waited = time.monotonic() - started
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str):
+        """Return (valid, new_hash); new_hash is set when the cost settings changed"""
+        valid, new_hash = await self._run(_verify_and_update, plain_password, hashed_password)
+        if new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2)
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    settings.password_hash_workers,
+    settings.password_hash_concurrency,
+    settings.password_hash_max_queue
+)
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy.orm import make_transient_to_detached
+from config.database import settings
+from app.models.user import User
+from app.utils.worker_signals import touch_signal, signal_time
+
+INVALIDATION_SIGNAL = "principals"
+
+class PrincipalCache:
+    """Per-worker TTL/LRU cache of authenticated users keyed by token subject.
+
+    Entries are detached User snapshots that are never attached to a session
+    themselves; callers merge them into their request session with
+    load=False, which costs no query.
+    """
+
+    def __init__(self, ttl_seconds: int, maxsize: int):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = signal_time(INVALIDATION_SIGNAL)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.maxsize > 0
+
+    def get(self, subject: str):
+        self._check_signal()
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, subject: str, user: User):
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str = None):
+        with self._lock:
+            if subject is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(subject, None)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _check_signal(self):
+        generation = signal_time(INVALIDATION_SIGNAL)
+        if generation != self._generation:
+            self._generation = generation
+            self.invalidate()
+
+principal_cache = PrincipalCache(settings.principal_cache_ttl_seconds, settings.principal_cache_size)
+
+def invalidate_principal(*usernames: str):
+    """Drop cached users here and tell the other workers to drop theirs"""
+    for username in usernames:
+        principal_cache.invalidate(username)
+    touch_signal(INVALIDATION_SIGNAL)
@@ -0,0 +1,176 @@
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from urllib.parse import parse_qs
+from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
+from config.database import SessionLocal, settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = ".collapsed"
+
+def profile_requested(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"x-profile" and value not in (b"", b"0", b"false"):
+            return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("__profile", ["0"])[0] not in ("", "0", "false")
+
+def _is_admin_token(scope) -> bool:
+    authorization = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            authorization = value.decode("latin-1")
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return False
+    try:
+        payload = jwt.decode(authorization[7:], settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return False
+    db = SessionLocal()
+    try:
+        is_admin = db.query(User.is_admin).filter(User.username == payload.get("sub")).scalar()
+    finally:
+        db.close()
+    return bool(is_admin)
+
+class StackSampler(threading.Thread):
+    """Samples the stacks of threads running one endpoint at a fixed interval.
+
+    The endpoint is only known once the router has matched, so it is read
+    from the scope on each tick. Concurrent requests to the same endpoint in
+    this worker land in the same profile.
+    """
+
+    def __init__(self, scope, interval_seconds: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.scope = scope
+        self.interval_seconds = interval_seconds
+        self.samples = 0
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval_seconds):
+            self.sample()
+
+    def sample(self):
+        code = getattr(self.scope.get("endpoint"), "__code__", None)
+        if code is None:
+            return
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.ident:
+                continue
+            names = []
+            matched = False
+            while frame is not None:
+                frame_code = frame.f_code
+                matched = matched or frame_code is code
+                names.append(f"{frame_code.co_name} ({os.path.basename(frame_code.co_filename)}:{frame_code.co_firstlineno})")
+                frame = frame.f_back
+            if matched:
+                self.stacks[";".join(reversed(names))] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+def _route_slug(scope) -> str:
+    route = scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    return re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+
+def save_profile(profile_id: str, scope, stacks: Counter) -> str:
+    """Write collapsed stacks (one "a;b;c count" line per stack) and prune old files"""
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    filename = f"{int(time.time())}-{profile_id}-{_route_slug(scope)}{PROFILE_SUFFIX}"
+    path = os.path.join(settings.profile_dir, filename)
+    with open(path, "w") as output:
+        for stack, count in stacks.most_common():
+            output.write(f"{stack} {count}\n")
+    prune_profiles(settings.profile_max_files)
+    return filename
+
+def list_profiles():
+    """Stored profiles, newest first"""
+    try:
+        entries = [entry for entry in os.scandir(settings.profile_dir) if entry.name.endswith(PROFILE_SUFFIX)]
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for entry in sorted(entries, key=lambda entry: entry.name, reverse=True):
+        created, profile_id, route = entry.name[:-len(PROFILE_SUFFIX)].split("-", 2)
+        profiles.append({
+            "id": profile_id,
+            "route": route,
+            "created_at": int(created),
+            "size": entry.stat().st_size
+        })
+    return profiles
+
+def profile_path(profile_id: str):
+    if not re.fullmatch(r"[0-9a-f]{16}", profile_id):
+        return None
+    for profile in list_profiles():
+        if profile["id"] == profile_id:
+            return os.path.join(settings.profile_dir, f"{profile['created_at']}-{profile_id}-{profile['route']}{PROFILE_SUFFIX}")
+    return None
+
+def prune_profiles(max_files: int):
+    try:
+        names = sorted(name for name in os.listdir(settings.profile_dir) if name.endswith(PROFILE_SUFFIX))
+    except FileNotFoundError:
+        return
+    for name in names[:max(0, len(names) - max_files)]:
+        try:
+            os.remove(os.path.join(settings.profile_dir, name))
+        except FileNotFoundError:
+            pass
+
+class ProfilingMiddleware:
+    """Profiles opted-in requests with a sampling profiler (pure ASGI).
+
+    A request is profiled when an admin sends X-Profile: 1 (or ?__profile=1),
+    or when it falls within PROFILE_SAMPLE_RATE. The profile id is returned
+    in X-Profile-Id and the report is fetched from /api/system/profiles.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+        if not sampled and not (profile_requested(scope) and await run_in_threadpool(_is_admin_token, scope)):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:16]
+        sampler = StackSampler(scope, settings.profile_interval_ms / 1000)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            if sampler.samples:
+                await run_in_threadpool(save_profile, profile_id, scope, sampler.stacks)
+            else:
+                logger.info("Profile %s collected no samples", profile_id)
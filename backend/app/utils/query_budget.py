@@ -0,0 +1,60 @@
+import logging
+from prometheus_client import Counter
+from sqlalchemy import event
+from config.database import settings
+from app.utils.metrics import current_request_stats, normalize_sql
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_VIOLATIONS = Counter(
+    "db_query_budget_violations_total", "Requests over their query budget or repeating a statement",
+    ["route", "kind"]
+)
+
+class QueryBudgetExceeded(Exception):
+    """Raised in QUERY_BUDGET_MODE=raise when a request breaks its budget"""
+
+def query_budget(max_queries: int, max_repeats: int = None):
+    """Declare the most SQL statements the endpoint may run per request.
+
+    Goes below the router decorator. max_repeats overrides
+    QUERY_REPEAT_THRESHOLD for endpoints that legitimately repeat a statement.
+    """
+    def decorator(endpoint):
+        endpoint.query_budget = (max_queries, max_repeats)
+        return endpoint
+    return decorator
+
+def endpoint_budget(endpoint):
+    """(max_queries, max_repeats) for an endpoint; max_queries is None if undeclared"""
+    max_queries, max_repeats = getattr(endpoint, "query_budget", (None, None))
+    return max_queries, max_repeats or settings.query_repeat_threshold
+
+def _violation(stats, kind: str, message: str):
+    if kind in stats.flagged:
+        return
+    stats.flagged.add(kind)
+    QUERY_BUDGET_VIOLATIONS.labels(stats.route, kind).inc()
+    if settings.query_budget_mode == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+def _check_budget(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats()
+    if stats is None or settings.query_budget_mode == "off":
+        return
+    stats.statements[statement] += 1
+    max_queries, max_repeats = endpoint_budget(stats.scope.get("endpoint"))
+
+    if max_queries is not None and stats.queries > max_queries:
+        _violation(stats, "budget", f"{stats.route} ran {stats.queries} queries, budget is {max_queries}")
+    if stats.statements[statement] > max_repeats:
+        _violation(
+            stats, "repeat",
+            f"Possible N+1 on {stats.route}: statement ran {stats.statements[statement]} times: "
+            f"{normalize_sql(statement)}"
+        )
+
+def install_query_budgets(engine):
+    """Check budgets after each statement; must follow instrument_engine, which does the counting"""
+    event.listen(engine, "after_cursor_execute", _check_budget)
@@ -0,0 +1,156 @@
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Request, status
+from sqlalchemy import create_engine, MetaData, Table, Column, String, Float, update, insert, select, delete, case
+from sqlalchemy.exc import IntegrityError
+from config.database import settings
+
+class MemoryBucketStore:
+    """Token buckets held in this worker's memory (LRU-bounded)"""
+
+    blocking = False
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, refill_per_second: float, now: float):
+        """Take one token; returns (allowed, retry_after_seconds)"""
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / refill_per_second
+
+class DatabaseBucketStore:
+    """Token buckets in a SQL table, shared by every worker using the same URL.
+
+    Each take is a single conditional UPDATE, so concurrent workers can't
+    both spend the last token. A bucket untouched for capacity / refill
+    seconds is full again, the same as a missing row, so such rows are
+    deleted now and then to keep the table to recently seen keys.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str):
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        self.engine = create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+        self.metadata = MetaData()
+        self.table = Table(
+            "rate_limit_buckets", self.metadata,
+            Column("key", String(200), primary_key=True),
+            Column("tokens", Float, nullable=False),
+            Column("updated_at", Float, nullable=False)
+        )
+        self._table_ready = False
+
+    def consume(self, key: str, capacity: int, refill_per_second: float, now: float):
+        if not self._table_ready:
+            self.metadata.create_all(self.engine)
+            self._table_ready = True
+
+        t = self.table
+        refilled = t.c.tokens + (now - t.c.updated_at) * refill_per_second
+        refilled = case((refilled > capacity, capacity), else_=refilled)
+        with self.engine.begin() as conn:
+            if random.random() < 0.01:
+                self._expire(conn, key, capacity / refill_per_second, now)
+            for _ in range(2):
+                taken = conn.execute(
+                    update(t)
+                    .where(t.c.key == key, refilled >= 1)
+                    .values(tokens=refilled - 1, updated_at=now)
+                ).rowcount
+                if taken:
+                    return True, 0.0
+
+                row = conn.execute(select(t.c.tokens, t.c.updated_at).where(t.c.key == key)).first()
+                if row is not None:
+                    break
+                try:
+                    with conn.begin_nested():
+                        conn.execute(insert(t).values(key=key, tokens=capacity - 1, updated_at=now))
+                    return True, 0.0
+                except IntegrityError:
+                    # Another worker created the bucket first; take from it
+                    continue
+            tokens = min(capacity, row.tokens + (now - row.updated_at) * refill_per_second) if row else 0
+            return False, (1 - tokens) / refill_per_second
+
+    def _expire(self, conn, key: str, refill_seconds: float, now: float):
+        # Buckets of one kind ("ip:", "user:") share capacity and refill rate
+        prefix = key.split(":", 1)[0] + ":"
+        t = self.table
+        conn.execute(delete(t).where(t.c.key.startswith(prefix, autoescape=True), t.c.updated_at < now - refill_seconds))
+
+class LoginRateLimiter:
+    """Per-IP and per-username token buckets checked before any bcrypt work"""
+
+    def __init__(self, store, max_tracked_keys: int = 1000):
+        self.store = store
+        self.max_tracked_keys = max_tracked_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client_ip: str, username: str):
+        now = time.time()
+        buckets = [
+            (f"ip:{client_ip}", settings.login_rate_limit_ip_burst, settings.login_rate_limit_ip_per_minute),
+            (f"user:{username.strip().lower()}", settings.login_rate_limit_user_burst, settings.login_rate_limit_user_per_minute)
+        ]
+        for key, capacity, per_minute in buckets:
+            allowed, retry_after = self.store.consume(key, capacity, per_minute / 60, now)
+            self._count(key, allowed)
+            if not allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, try again later",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+                )
+
+    def _count(self, key: str, allowed: bool):
+        with self._lock:
+            counts = self._counters.pop(key, None) or {"allowed": 0, "limited": 0}
+            counts["allowed" if allowed else "limited"] += 1
+            self._counters[key] = counts
+            while len(self._counters) > self.max_tracked_keys:
+                self._counters.popitem(last=False)
+
+    def stats(self, top: int = 20) -> dict:
+        with self._lock:
+            counters = list(self._counters.items())
+        limited = sorted((item for item in counters if item[1]["limited"]), key=lambda item: -item[1]["limited"])
+        return {
+            "backend": type(self.store).__name__,
+            "tracked_keys": len(counters),
+            "allowed": sum(c["allowed"] for _, c in counters),
+            "limited": sum(c["limited"] for _, c in counters),
+            "top_limited": dict(limited[:top])
+        }
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit_trust_forwarded_for:
+        forwarded = [entry.strip() for entry in request.headers.get("x-forwarded-for", "").split(",") if entry.strip()]
+        if forwarded:
+            # Each trusted proxy appends the address it saw; entries further
+            # left came from the client and could be anything
+            return forwarded[-min(max(settings.rate_limit_trusted_proxies, 1), len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+def _create_store():
+    if settings.rate_limit_storage_url:
+        return DatabaseBucketStore(settings.rate_limit_storage_url)
+    return MemoryBucketStore(settings.rate_limit_max_keys)
+
+login_rate_limiter = LoginRateLimiter(_create_store())
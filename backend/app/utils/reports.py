@@ -0,0 +1,194 @@
+import contextvars
+import csv
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import orjson
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from config.database import SessionLocal, settings
+import app.models  # noqa: F401 - report processes need every mapper configured
+from app.models.intern import Intern
+from app.models.task import Task
+from app.models.report import ReportJob, ReportStatus
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {"json": "application/json", "csv": "text/csv"}
+ACTIVE_STATUSES = (ReportStatus.PENDING, ReportStatus.RUNNING)
+
+_report_pool = None
+
+def definition_hash(kind: str, params: dict, format: str):
+    """(canonical params JSON, hash identifying the report definition)"""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return canonical, hashlib.sha256(f"{kind}|{canonical}|{format}".encode()).hexdigest()
+
+def data_version(db) -> str:
+    """Changes whenever an intern or task is added, edited or deleted, and
+    every UTC day, since report windows end today (one query)"""
+    row = db.execute(select(
+        select(func.count(Intern.id)).scalar_subquery(),
+        select(func.max(Intern.updated_at)).scalar_subquery(),
+        select(func.count(Task.id)).scalar_subquery(),
+        select(func.max(Task.updated_at)).scalar_subquery()
+    )).one()
+    return hashlib.sha256(repr((datetime.utcnow().date(), *row)).encode()).hexdigest()
+
+def artifact_path(job: ReportJob) -> str:
+    return os.path.join(settings.report_dir, job.artifact)
+
+def enqueue_report(db, kind: str, params: dict, format: str, user_id: int):
+    """Return (job, created), reusing a pending job or a finished report of
+    the same definition computed against the current data"""
+    canonical, digest = definition_hash(kind, params, format)
+    version = data_version(db)
+    existing = db.query(ReportJob).filter(
+        ReportJob.definition_hash == digest,
+        or_(
+            ReportJob.status.in_(ACTIVE_STATUSES),
+            and_(ReportJob.status == ReportStatus.COMPLETED, ReportJob.data_version == version)
+        )
+    ).order_by(ReportJob.id.desc()).first()
+
+    if existing is not None and existing.status in ACTIVE_STATUSES:
+        # A job whose worker died (deploy, crash) never finishes; replace it
+        if existing.created_at >= datetime.utcnow() - timedelta(seconds=settings.report_job_timeout_seconds):
+            return existing, False
+        existing.status = ReportStatus.FAILED
+        existing.error = "Abandoned: not finished within REPORT_JOB_TIMEOUT_SECONDS"
+        existing.finished_at = datetime.utcnow()
+    elif existing is not None and os.path.exists(artifact_path(existing)):
+        return existing, False
+
+    job = ReportJob(
+        kind=kind, params=canonical, format=format, definition_hash=digest,
+        data_version=version, requested_by=user_id
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # An identical request enqueued the same job first; reuse it
+        db.rollback()
+        return enqueue_report(db, kind, params, format, user_id)
+    submit_report(job.id)
+    return job, True
+
+def ensure_report_indexes(engine):
+    """Create report job indexes missing from tables built before they existed.
+
+    Duplicate active jobs from before the unique index are failed first,
+    keeping the newest of each.
+    """
+    newer = aliased(ReportJob)
+    with engine.begin() as connection:
+        connection.execute(update(ReportJob).where(
+            ReportJob.status.in_(ACTIVE_STATUSES),
+            select(newer.id).where(
+                newer.definition_hash == ReportJob.definition_hash,
+                newer.data_version == ReportJob.data_version,
+                newer.status.in_(ACTIVE_STATUSES),
+                newer.id > ReportJob.id
+            ).exists()
+        ).values(status=ReportStatus.FAILED, error="Superseded by an identical job", finished_at=datetime.utcnow()))
+    for index in ReportJob.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+def _compute(db, kind: str, params: dict):
+    # Imported here: only report processes need the query code
+    from app.routes.analytics import analytics_data, department_report
+    if kind == "analytics":
+        return analytics_data(db, params["timeRange"])
+    return department_report(db, params["timeRange"])
+
+def _analytics_rows(data: dict):
+    # Long format (section, label, metric, value) so the nested payload fits one table
+    for key, value in data.items():
+        if not isinstance(value, list):
+            yield {"section": "summary", "label": "", "metric": key, "value": value}
+            continue
+        for item in value:
+            label_key = next(iter(item))
+            for metric, metric_value in item.items():
+                if metric != label_key:
+                    yield {"section": key, "label": item[label_key], "metric": metric, "value": metric_value}
+
+def render(kind: str, data, format: str) -> bytes:
+    if format == "json":
+        return orjson.dumps(data)
+    rows = list(_analytics_rows(data)) if kind == "analytics" else data
+    buffer = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+def run_report_job(job_id: int):
+    """Compute a pending job and write its artifact; runs in a report process"""
+    db = SessionLocal()
+    try:
+        job = db.get(ReportJob, job_id)
+        if job is None or job.status != ReportStatus.PENDING:
+            return
+        job.status = ReportStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        db.commit()
+
+        try:
+            body = render(job.kind, _compute(db, job.kind, json.loads(job.params)), job.format)
+            os.makedirs(settings.report_dir, exist_ok=True)
+            filename = f"report-{job.id}.{job.format}"
+            temp_path = os.path.join(settings.report_dir, f".{uuid.uuid4().hex}.part")
+            with open(temp_path, "wb") as artifact:
+                artifact.write(body)
+            os.replace(temp_path, os.path.join(settings.report_dir, filename))
+            job.artifact = filename
+            job.status = ReportStatus.COMPLETED
+        except Exception as e:
+            logger.exception("Report job %s failed", job_id)
+            db.rollback()
+            job.status = ReportStatus.FAILED
+            job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+def _get_executor():
+    # Created on first use so gunicorn forks workers before any pool exists
+    global _report_pool
+    if _report_pool is None and settings.report_workers > 0:
+        _report_pool = ProcessPoolExecutor(
+            max_workers=settings.report_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _report_pool
+
+def _log_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Report process failed: %s", future.exception())
+
+def submit_report(job_id: int):
+    executor = _get_executor()
+    if executor is None:
+        # REPORT_WORKERS=0 runs the job inline (development, budget checks),
+        # in a fresh context so its SQL isn't charged to the request
+        contextvars.Context().run(run_report_job, job_id)
+        return
+    executor.submit(run_report_job, job_id).add_done_callback(_log_failure)
+
+def shutdown_report_pool():
+    # Jobs still queued stay pending and are replaced once they time out
+    global _report_pool
+    if _report_pool is not None:
+        _report_pool.shutdown(wait=False, cancel_futures=True)
+        _report_pool = None
@@ -0,0 +1,12 @@
+from fastapi.responses import ORJSONResponse
+
+def json_response(content, status_code: int = 200, headers: dict = None) -> ORJSONResponse:
+    """Serialize plain dicts and lists with orjson, bypassing response_model.
+
+    Handlers keep response_model for the OpenAPI schema but build dicts
+    straight from rows and return this, so each payload is encoded once
+    instead of being built as models, re-validated and dumped again.
+    orjson writes datetimes as ISO 8601 and enums as their values, matching
+    the models' JSON.
+    """
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
@@ -0,0 +1,39 @@
+import os
+import time
+from config.database import settings
+
+# Workers on the same host share nothing in memory, so cross-worker signals
+# are plain files: writers touch them and readers compare the mtime, which
+# costs one stat() call and no database round trip.
+
+def _signal_path(name: str) -> str:
+    return os.path.join(settings.worker_signal_dir, name)
+
+def touch_signal(name: str):
+    """Bump the signal's timestamp, creating it if needed"""
+    os.makedirs(settings.worker_signal_dir, exist_ok=True)
+    path = _signal_path(name)
+    with open(path, "a"):
+        os.utime(path, None)
+
+def signal_time(name: str) -> int:
+    """Return the signal's last-touched time in ns, or 0 if never touched"""
+    try:
+        return os.stat(_signal_path(name)).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def prune_signals(prefix: str, max_age_seconds: float):
+    """Remove signals with the given prefix not touched within max_age_seconds"""
+    cutoff = time.time() - max_age_seconds
+    try:
+        entries = list(os.scandir(settings.worker_signal_dir))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.name.startswith(prefix):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
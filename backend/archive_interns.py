@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Intern Archival Script
+
+Moves INACTIVE interns not updated for ARCHIVE_INACTIVE_DAYS, with their
+tasks, into the archive tables in batches. Safe to run from cron.
+
+    python archive_interns.py                 # archive
+    python archive_interns.py --restore 12 40 # move interns 12 and 40 back
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import SessionLocal, engine, Base
+from app.models import InternArchive, TaskArchive
+from app.utils.intern_archive import archive_inactive_interns, restore_interns
+
+def run_archival(args):
+    """Archive inactive interns, or restore the given ones"""
+    Base.metadata.create_all(bind=engine, tables=[InternArchive.__table__, TaskArchive.__table__])
+
+    db = SessionLocal()
+    try:
+        if args.restore:
+            restored = restore_interns(db, args.restore)
+            print(f"Restored {restored} interns")
+            return
+        moved = archive_inactive_interns(db, days=args.days)
+    finally:
+        db.close()
+    print(f"Archived {moved['interns']} interns and {moved['tasks']} tasks")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=None, help="override ARCHIVE_INACTIVE_DAYS")
+    parser.add_argument("--restore", type=int, nargs="+", metavar="INTERN_ID")
+    run_archival(parser.parse_args())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Query Budget Check
+
+Seeds a throwaway SQLite database, calls every API route once with
+QUERY_BUDGET_MODE=raise and reports the SQL statements each one ran
+against its @query_budget. Exits non-zero if a route is over budget,
+repeats a statement (likely N+1) or declares no budget; CI runs it on every
+push and pull request (.github/workflows/query-budgets.yml).
+
+    python -m benchmarks.check_query_budgets
+"""
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="ims-budgets-"), "budgets.db")
+
+# Settings are read at import time, so configure before importing the app
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{DATABASE_PATH}",
+    "QUERY_BUDGET_MODE": "raise",
+    "AUTO_BOOTSTRAP": "false",
+    "PASSWORD_HASH_WORKERS": "0",
+    "BCRYPT_ROUNDS": "4",
+    "PRINCIPAL_CACHE_TTL_SECONDS": "0",  # budget the uncached path
+    "UPLOAD_DIR": os.path.join(os.path.dirname(DATABASE_PATH), "uploads"),
+    "REPORT_DIR": os.path.join(os.path.dirname(DATABASE_PATH), "reports"),
+    "REPORT_WORKERS": "0",  # reports finish inside the POST, outside its budget
+    "CHANGE_FEED_SETTLE_MS": "0",  # so the feed returns the writes made above it
+})
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+sys.path.append(BACKEND_DIR)
+
+from sqlalchemy import event, insert
+from fastapi.routing import APIRoute
+from starlette.testclient import TestClient
+from config.database import engine
+from app.main import app
+from app.models import NotificationInbox
+from app.utils.query_budget import QueryBudgetExceeded, endpoint_budget
+from benchmarks.generate_data import generate
+
+# 1x1 transparent PNG for the avatar upload
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+# (method, path, request kwargs); ids refer to the seeded data. "expect"
+# overrides the expected status (200).
+CALLS = [
+    ("POST", "/api/auth/login", {"data": {"username": "admin", "password": "admin123"}}),
+    ("GET", "/api/dashboard/stats", {}),
+    ("GET", "/api/dashboard/departments", {}),
+    ("GET", "/api/dashboard/recent-activities", {}),
+    ("GET", "/api/dashboard/top-performers", {}),
+    ("GET", "/api/analytics", {"params": {"timeRange": "90d"}}),
+    ("GET", "/api/interns", {"params": {"limit": 50}}),
+    ("GET", "/api/interns/1", {}),
+    ("GET", "/api/interns", {"params": {"limit": 50, "include_archived": "true"}}),
+    ("GET", "/api/interns", {"params": {"limit": 50, "fields": "full_name,status", "include": "task_stats"}}),
+    ("GET", "/api/tasks/intern/1", {"params": {"fields": "title,status"}}),
+    ("GET", "/api/interns/1", {"params": {"include": "tasks", "tasks_limit": 3}}),
+    ("GET", "/api/tasks/intern/1", {"params": {"sort": "-deadline", "limit": 3}}),
+    ("GET", "/api/interns/1", {"params": {"include_archived": "true"}}),
+    ("GET", "/api/dashboard/stats", {"params": {"include_archived": "true"}}),
+    ("GET", "/api/tasks/intern/1", {"params": {"include_archived": "true"}}),
+    ("POST", "/api/interns/1/restore", {"expect": 404}),
+    ("POST", "/api/interns", {"json": {"full_name": "Budget Check", "email": "budget@example.com", "phone": "555", "department": "Engineering"}}),
+    ("PUT", "/api/interns/2", {"json": {"position": "Lead Intern"}}),
+    ("GET", "/api/tasks/intern/1", {}),
+    ("GET", "/api/tasks/1", {}),
+    ("POST", "/api/tasks/", {"json": {"intern_id": 1, "title": "Budget task", "deadline": "2030-01-01T00:00:00"}}),
+    ("PUT", "/api/tasks/1", {"json": {"status": "overdue"}}),
+    ("DELETE", "/api/tasks/2", {}),
+    ("DELETE", "/api/interns/3", {}),
+    ("GET", "/api/notifications/", {"params": {"limit": 50}}),
+    ("GET", "/api/notifications/unread-count", {}),
+    ("PUT", "/api/notifications/read", {"json": {"ids": [1, 2, 3], "up_to": 10}}),
+    ("PUT", "/api/notifications/20/read", {}),
+    ("PUT", "/api/notifications/mark-all-read", {}),
+    ("GET", "/api/users/profile", {}),
+    ("PUT", "/api/users/profile", {"json": {"full_name": "Budget Admin"}}),
+    ("POST", "/api/users/profile/avatar", {"files": {"file": ("avatar.png", PNG, "image/png")}}),
+    ("GET", "/api/system/stats", {}),
+    ("GET", "/api/system/profiles", {}),
+    ("GET", "/api/system/profiles/0123456789abcdef", {"expect": 404}),
+    ("POST", "/api/reports", {"json": {"kind": "departments", "timeRange": "90d", "format": "csv"}, "expect": 202}),
+    ("GET", "/api/reports/1", {}),
+    ("GET", "/api/reports/1/download", {}),
+    ("GET", "/api/changes", {}),
+    ("GET", "/api/changes", {"params": {"since": 0}}),
+    # Queries column includes the sub-requests, each checked against its own budget
+    ("POST", "/api/batch", {"json": {"requests": [
+        {"path": "/api/dashboard/stats"}, {"path": "/api/dashboard/top-performers"},
+        {"path": "/api/notifications/?limit=20"}, {"path": "/api/notifications/unread-count"}
+    ]}}),
+]
+
+def route_for(method, path):
+    scope = {"type": "http", "method": method, "path": path}
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.matches(scope)[0].name == "FULL":
+            return route
+    return None
+
+def run(args):
+    from bootstrap import bootstrap
+    bootstrap()
+    generate(argparse.Namespace(
+        interns=args.interns, tasks_per_intern=args.tasks_per_intern, departments=6,
+        notifications=args.notifications, days=120, batch_size=1000, seed=7
+    ))
+
+    # An inbox with nothing read, so the read endpoints do real work
+    with engine.begin() as connection:
+        connection.execute(insert(NotificationInbox).values(user_id=1, last_read_id=0, unread_count=args.notifications))
+
+    executed = []
+    event.listen(engine, "after_cursor_execute", lambda *a: executed.append(1))
+
+    failures = []
+    covered = set()
+    with TestClient(app) as client:
+        response = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        print(f"{'route':<48} {'status':>6} {'queries':>8} {'budget':>7}")
+        for method, path, kwargs in CALLS:
+            kwargs = dict(kwargs)
+            expected = kwargs.pop("expect", 200)
+            route = route_for(method, path)
+            covered.add((method, route.path))
+            max_queries, _ = endpoint_budget(route.endpoint)
+            executed.clear()
+            try:
+                status = client.request(method, path, headers=headers, **kwargs).status_code
+                problem = None if status == expected else f"status {status}, expected {expected}"
+            except QueryBudgetExceeded as e:
+                status, problem = "-", str(e)
+            print(f"{method + ' ' + route.path:<48} {status:>6} {len(executed):>8} {str(max_queries):>7}")
+            if max_queries is None:
+                problem = problem or "no @query_budget declared"
+            if problem:
+                failures.append(f"{method} {route.path}: {problem}")
+
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path.startswith("/api"):
+            for method in route.methods:
+                if (method, route.path) not in covered:
+                    failures.append(f"{method} {route.path}: not exercised by the budget check")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interns", type=int, default=40)
+    parser.add_argument("--tasks-per-intern", type=int, default=8)
+    parser.add_argument("--notifications", type=int, default=60)
+    sys.exit(run(parser.parse_args()))
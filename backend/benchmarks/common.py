@@ -0,0 +1,65 @@
+"""
+Shared helpers for the benchmark scripts (standard library only, so they
+run against any deployment without extra installs).
+"""
+
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+def http_request(base_url, method, path, token=None, data=None, form=None, headers=None, timeout=30):
+    """Send a request and return (status, elapsed_seconds, body_bytes)"""
+    request_headers = dict(headers or {})
+    body = None
+    if token:
+        request_headers["Authorization"] = f"Bearer {token}"
+    if form is not None:
+        body = urllib.parse.urlencode(form).encode()
+        request_headers["Content-Type"] = "application/x-www-form-urlencoded"
+    elif data is not None:
+        body = json.dumps(data).encode()
+        request_headers["Content-Type"] = "application/json"
+
+    request = urllib.request.Request(base_url + path, data=body, method=method, headers=request_headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    except (urllib.error.URLError, TimeoutError):
+        payload = b""
+        status = 0
+    return status, time.perf_counter() - started, payload
+
+def login(base_url, username, password):
+    status, _, payload = http_request(
+        base_url, "POST", "/api/auth/login", form={"username": username, "password": password}
+    )
+    if status != 200:
+        raise SystemExit(f"Login failed with status {status}: {payload[:200]!r}")
+    return json.loads(payload)["access_token"]
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(latencies, elapsed=None):
+    """Latency summary in milliseconds"""
+    summary = {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0
+    }
+    if elapsed:
+        summary["throughput_rps"] = round(len(latencies) / elapsed, 2)
+    return summary
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compression Benchmark
+
+Fetches each frontend endpoint uncompressed from a running API, then
+compresses the payloads locally at a few gzip levels (and brotli qualities,
+if the brotli package is installed) to report bytes saved against CPU time
+per response.
+
+    python -m benchmarks.compression --base-url http://localhost:8000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import http_request, login
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENDPOINTS = [
+    "/api/interns?page=1&limit=100",
+    "/api/interns?page=1&limit=10",
+    "/api/analytics?timeRange=1y",
+    "/api/dashboard/stats",
+    "/api/dashboard/recent-activities",
+    "/api/dashboard/top-performers",
+    "/api/notifications/?limit=100",
+]
+
+def first_intern_id(base_url, token):
+    status, _, payload = http_request(base_url, "GET", "/api/interns?page=1&limit=1", token=token)
+    interns = json.loads(payload)["interns"] if status == 200 else []
+    return interns[0]["id"] if interns else None
+
+def gzip_bytes(payload, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(payload) + compressor.flush()
+
+def measure(payload, compress, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compress(payload)
+    return len(compressed), (time.perf_counter() - started) / repeat * 1e6
+
+def run(args):
+    token = login(args.base_url, args.username, args.password)
+    endpoints = list(ENDPOINTS)
+    intern_id = first_intern_id(args.base_url, token)
+    if intern_id is not None:
+        endpoints.append(f"/api/tasks/intern/{intern_id}")
+
+    codecs = [(f"gzip-{level}", lambda data, level=level: gzip_bytes(data, level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality))
+                   for quality in (4, 11)]
+
+    results = {}
+    for path in endpoints:
+        status, _, payload = http_request(
+            args.base_url, "GET", path, token=token, headers={"Accept-Encoding": "identity"}
+        )
+        if status != 200:
+            results[path] = {"status": status}
+            continue
+        entry = {"bytes": len(payload)}
+        for name, compress in codecs:
+            size, cpu_us = measure(payload, compress, args.repeat)
+            entry[name] = {
+                "bytes": size,
+                "saved_pct": round((1 - size / len(payload)) * 100, 1) if payload else 0.0,
+                "cpu_us": round(cpu_us, 1)
+            }
+        results[path] = entry
+    return {"brotli_available": brotli is not None, "endpoints": results}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--repeat", type=int, default=50)
+    print(json.dumps(run(parser.parse_args()), indent=2))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark Data Generator
+
+Bulk-inserts a reproducible synthetic dataset (interns, tasks and
+notifications) into DATABASE_URL with multi-row Core inserts. Rows are
+appended to whatever is already there; run bootstrap.py first.
+
+    python -m benchmarks.generate_data --interns 5000 --tasks-per-intern 20 --notifications 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select, update
+from config.database import engine
+from app.models import Intern, InternArchive, Task, Notification, NotificationInbox
+from app.models.intern import InternStatus
+from app.models.task import TaskStatus
+
+DEPARTMENTS = [
+    "Engineering", "Design", "Marketing", "Sales", "Finance", "Operations",
+    "Human Resources", "Product", "Data", "Support", "Legal", "Research"
+]
+POSITIONS = ["Frontend Intern", "Backend Intern", "Analyst Intern", "Design Intern", "Research Intern"]
+UNIVERSITIES = ["State University", "Tech Institute", "City College", "National University"]
+SKILLS = ["Python", "JavaScript", "React", "SQL", "Figma", "Excel", "Go", "Docker", "Communication"]
+NOTIFICATION_TYPES = ["intern_created", "task_assigned", "task_completed", "task_overdue"]
+
+def chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def bulk_insert(connection, table, rows, batch_size):
+    for batch in chunks(rows, batch_size):
+        connection.execute(insert(table), batch)
+
+def bulk_insert_ids(connection, table, rows, batch_size) -> list:
+    """Insert rows and return their database-assigned ids, in row order"""
+    ids = []
+    statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+    for batch in chunks(rows, batch_size):
+        ids.extend(connection.execute(statement, batch).scalars())
+    return ids
+
+def generate(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    departments = [
+        DEPARTMENTS[i % len(DEPARTMENTS)] + (f" {i // len(DEPARTMENTS) + 1}" if i >= len(DEPARTMENTS) else "")
+        for i in range(args.departments)
+    ]
+
+    def past(days):
+        return now - timedelta(days=rng.uniform(0, days), seconds=rng.randint(0, 86399))
+
+    counts = {}
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        # Ids come from the database (its sequence stays in step); the number
+        # in names and emails only has to be above every intern so far,
+        # archived ones included, to keep emails unique
+        first_number = max(
+            connection.execute(select(func.max(Intern.id))).scalar() or 0,
+            connection.execute(select(func.max(InternArchive.id))).scalar() or 0
+        ) + 1
+
+        interns = []
+        for number in range(first_number, first_number + args.interns):
+            joined = past(args.days)
+            interns.append({
+                "full_name": f"Intern {number}",
+                "email": f"intern{number}@bench.example.com",
+                "phone": f"555{number:07d}"[-20:],
+                "department": rng.choice(departments),
+                "position": rng.choice(POSITIONS),
+                "university": rng.choice(UNIVERSITIES),
+                "skills": json.dumps(rng.sample(SKILLS, 3)),
+                "tech": json.dumps(rng.sample(SKILLS, 2)),
+                "join_date": joined,
+                "status": InternStatus.ACTIVE if rng.random() < 0.8 else InternStatus.INACTIVE,
+                "created_at": joined,
+                "updated_at": joined
+            })
+        intern_ids = bulk_insert_ids(connection, Intern.__table__, interns, args.batch_size)
+        counts["interns"] = len(interns)
+
+        tasks = []
+        for intern_id, intern in zip(intern_ids, interns):
+            for number in range(args.tasks_per_intern):
+                created = intern["join_date"] + (now - intern["join_date"]) * rng.random()
+                deadline = created + timedelta(days=rng.randint(1, 30))
+                if rng.random() < 0.6:
+                    status = TaskStatus.COMPLETED
+                else:
+                    status = TaskStatus.OVERDUE if deadline < now else TaskStatus.PENDING
+                tasks.append({
+                    "intern_id": intern_id,
+                    "title": f"Task {number + 1} for intern {intern_id}",
+                    "description": "Generated benchmark task",
+                    "deadline": deadline,
+                    "status": status,
+                    "created_at": created,
+                    "updated_at": created if status != TaskStatus.COMPLETED else min(now, deadline)
+                })
+        bulk_insert(connection, Task.__table__, tasks, args.batch_size)
+        counts["tasks"] = len(tasks)
+
+        notifications = []
+        for number in range(args.notifications):
+            created = past(args.days)
+            notifications.append({
+                "type": rng.choice(NOTIFICATION_TYPES),
+                "title": f"Benchmark notification {number + 1}",
+                "message": "Generated benchmark notification",
+                "is_read": False,
+                "created_at": created,
+                "priority": rng.choice(["low", "medium", "medium", "high"])
+            })
+        notifications.sort(key=lambda row: row["created_at"])
+        bulk_insert(connection, Notification.__table__, notifications, args.batch_size)
+        counts["notifications"] = len(notifications)
+
+        # Same bookkeeping as create_notification: new rows are unread for every inbox
+        if notifications:
+            connection.execute(
+                update(NotificationInbox).values(unread_count=NotificationInbox.unread_count + len(notifications))
+            )
+
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    counts["database"] = engine.url.render_as_string(hide_password=True)
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interns", type=int, default=1000)
+    parser.add_argument("--tasks-per-intern", type=int, default=10)
+    parser.add_argument("--departments", type=int, default=8)
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=365, help="Spread of join/creation dates into the past")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    print(json.dumps(generate(parser.parse_args()), indent=2))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Load Test
+
+Drives the endpoints the frontend calls with concurrent clients against a
+running API and reports per-endpoint p50/p95/p99 latency, throughput and
+SQL statements per request (from the /metrics deltas). Results are written
+as JSON tagged with the git commit, so runs can be compared across commits
+and databases.
+
+    python -m benchmarks.generate_data --interns 2000
+    python -m benchmarks.load_test --base-url http://localhost:8000 --duration 30 --label sqlite
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import http_request, login, summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, weight, path); {intern_id} is filled from the seeded interns
+SCENARIO = [
+    ("dashboard_stats", 10, "/api/dashboard/stats"),
+    ("dashboard_departments", 5, "/api/dashboard/departments"),
+    ("dashboard_recent_activities", 5, "/api/dashboard/recent-activities"),
+    ("dashboard_top_performers", 5, "/api/dashboard/top-performers"),
+    ("analytics", 5, "/api/analytics?timeRange=30d"),
+    ("interns_list", 15, "/api/interns?page=1&limit=10"),
+    ("interns_search", 5, "/api/interns?page=1&limit=10&search=Intern%201"),
+    ("intern_detail", 10, "/api/interns/{intern_id}"),
+    ("intern_tasks", 10, "/api/tasks/intern/{intern_id}"),
+    ("notifications", 10, "/api/notifications/?limit=50"),
+    ("notifications_unread_count", 20, "/api/notifications/unread-count"),
+]
+
+# Route templates as reported by /metrics, for the query counts
+ROUTES = {
+    "dashboard_stats": "/api/dashboard/stats",
+    "dashboard_departments": "/api/dashboard/departments",
+    "dashboard_recent_activities": "/api/dashboard/recent-activities",
+    "dashboard_top_performers": "/api/dashboard/top-performers",
+    "analytics": "/api/analytics",
+    "interns_list": "/api/interns",
+    "interns_search": "/api/interns",
+    "intern_detail": "/api/interns/{intern_id}",
+    "intern_tasks": "/api/tasks/intern/{intern_id}",
+    "notifications": "/api/notifications/",
+    "notifications_unread_count": "/api/notifications/unread-count",
+}
+
+METRIC_LINE = re.compile(r'^(\w+)\{(.*)\} ([0-9.e+-]+)$')
+
+def git_sha():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def scrape_route_counters(base_url):
+    """Return {route: {"requests": n, "queries": n}} from /metrics, or None"""
+    status, _, payload = http_request(base_url, "GET", "/metrics")
+    if status != 200:
+        return None
+    counters = {}
+    for line in payload.decode().splitlines():
+        match = METRIC_LINE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        route = re.search(r'route="([^"]*)"', labels)
+        if route is None:
+            continue
+        entry = counters.setdefault(route.group(1), {"requests": 0.0, "queries": 0.0})
+        if name == "http_request_db_queries_count":
+            entry["requests"] += float(value)
+        elif name == "db_queries_total":
+            entry["queries"] += float(value)
+    return counters
+
+def queries_per_request(before, after):
+    if before is None or after is None:
+        return {}
+    result = {}
+    for route, counts in after.items():
+        previous = before.get(route, {"requests": 0.0, "queries": 0.0})
+        requests = counts["requests"] - previous["requests"]
+        if requests > 0:
+            result[route] = round((counts["queries"] - previous["queries"]) / requests, 2)
+    return result
+
+def seeded_intern_ids(base_url, token, limit):
+    status, _, payload = http_request(base_url, "GET", f"/api/interns?page=1&limit={limit}", token=token)
+    if status != 200:
+        raise SystemExit(f"Could not list interns (status {status})")
+    ids = [intern["id"] for intern in json.loads(payload)["interns"]]
+    if not ids:
+        raise SystemExit("No interns found; run benchmarks.generate_data first")
+    return ids
+
+def run(args):
+    token = login(args.base_url, args.username, args.password)
+    intern_ids = seeded_intern_ids(args.base_url, token, 100)
+    names = [name for name, _, _ in SCENARIO]
+    weights = [weight for _, weight, _ in SCENARIO]
+    paths = {name: path for name, _, path in SCENARIO}
+
+    # One pass over every endpoint so caches and pools are warm
+    for name in names:
+        http_request(args.base_url, "GET", paths[name].format(intern_id=intern_ids[0]), token=token)
+
+    before = scrape_route_counters(args.base_url)
+    latencies = {name: [] for name in names}
+    errors = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            path = paths[name].format(intern_id=rng.choice(intern_ids))
+            status, elapsed, _ = http_request(args.base_url, "GET", path, token=token)
+            with lock:
+                if status == 200:
+                    latencies[name].append(elapsed)
+                else:
+                    errors[f"{name}:{status}"] = errors.get(f"{name}:{status}", 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(client, range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    after = scrape_route_counters(args.base_url)
+
+    per_route_queries = queries_per_request(before, after)
+    endpoints = {}
+    for name in names:
+        summary = summarize(latencies[name], elapsed)
+        summary["queries_per_request"] = per_route_queries.get(ROUTES[name])
+        endpoints[name] = summary
+
+    return {
+        "label": args.label,
+        "git_sha": git_sha(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_seconds": round(elapsed, 2),
+        "overall": summarize([value for values in latencies.values() for value in values], elapsed),
+        "errors": errors,
+        "endpoints": endpoints
+    }
+
+def save(result, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+    path = os.path.join(output_dir, f"{stamp}-{result['git_sha']}-{result['label']}.json")
+    with open(path, "w") as output:
+        json.dump(result, output, indent=2)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--label", default="run", help="Tag for the result file, e.g. sqlite or postgres")
+    parser.add_argument("--output-dir", default=os.path.join(BACKEND_DIR, "benchmarks", "results"))
+    args = parser.parse_args()
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    print(f"Saved to {save(result, args.output_dir)}", file=sys.stderr)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Login Storm Benchmark
+
+Fires concurrent logins at a running API while a probe client keeps
+requesting a cheap endpoint. Compares probe latency before and during the
+storm to show whether bcrypt work starves the rest of the API.
+
+    python -m benchmarks.login_storm --base-url http://localhost:8000 --logins 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import http_request, summarize
+
+def probe(base_url, path, stop, latencies):
+    while not stop.is_set():
+        status, elapsed, _ = http_request(base_url, "GET", path)
+        if status == 200:
+            latencies.append(elapsed)
+        time.sleep(0.01)
+
+def probe_for(base_url, path, seconds):
+    stop, latencies = threading.Event(), []
+    thread = threading.Thread(target=probe, args=(base_url, path, stop, latencies))
+    thread.start()
+    time.sleep(seconds)
+    stop.set()
+    thread.join()
+    return latencies
+
+def run(args):
+    baseline = probe_for(args.base_url, args.probe_path, args.baseline_seconds)
+
+    stop, during = threading.Event(), []
+    probe_thread = threading.Thread(target=probe, args=(args.base_url, args.probe_path, stop, during))
+    probe_thread.start()
+
+    statuses = {}
+    login_latencies = []
+    lock = threading.Lock()
+
+    def attempt(_):
+        status, elapsed, _ = http_request(
+            args.base_url, "POST", "/api/auth/login",
+            form={"username": args.username, "password": args.password}
+        )
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                login_latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(attempt, range(args.logins)))
+    storm_seconds = time.perf_counter() - started
+
+    stop.set()
+    probe_thread.join()
+
+    return {
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "storm_seconds": round(storm_seconds, 2),
+        "login_statuses": statuses,
+        "login_latency": summarize(login_latencies, storm_seconds),
+        "probe_baseline": summarize(baseline),
+        "probe_during_storm": summarize(during)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    print(json.dumps(run(parser.parse_args()), indent=2))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Lookup Microbenchmark
+
+Per-call cost of the single-row lookups on the request hot path (user by
+username, intern and task by id) against a throwaway SQLite database:
+
+  uncompiled  db.query(...).filter(...).first() with the compiled cache off
+  query       the same query with SQLAlchemy's compiled cache (the old path)
+  lookup      app.repositories.lookups (lambda statements, Session.get)
+  identity    the lookup again while the session holds the object (no SQL
+              for Session.get; the username lookup still queries)
+
+Each call except `identity` starts from an empty identity map, as a new
+request would. Also reports the compiled-cache hit rate of the run.
+
+    python -m benchmarks.lookups --calls 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="ims-lookups-"), "lookups.db")
+
+# Settings are read at import time, so configure before importing the app
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{DATABASE_PATH}",
+    "PASSWORD_HASH_WORKERS": "0",
+    "BCRYPT_ROUNDS": "4",
+})
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import Session
+from config.database import engine
+import app.main  # noqa: F401 - instruments the engine
+from app.models import Intern, Task, User
+from app.repositories import lookups
+from app.utils.metrics import statement_cache_stats
+from benchmarks.generate_data import generate
+
+def per_call_us(db, lookup, keys, calls, clear=True):
+    started = time.perf_counter()
+    for number in range(calls):
+        if clear:
+            db.expunge_all()
+        lookup(db, keys[number % len(keys)])
+    return round((time.perf_counter() - started) / calls * 1e6, 1)
+
+def cases(intern_ids, task_ids):
+    return {
+        "user_by_username": (
+            ["admin"],
+            lambda db, name: db.query(User).filter(User.username == name).first(),
+            lookups.user_by_username
+        ),
+        "intern_by_id": (
+            intern_ids,
+            lambda db, key: db.query(Intern).filter(Intern.id == key).first(),
+            lookups.intern
+        ),
+        "task_by_id": (
+            task_ids,
+            lambda db, key: db.query(Task).filter(Task.id == key).first(),
+            lookups.task
+        ),
+    }
+
+def run(args):
+    from bootstrap import bootstrap
+    bootstrap()
+    generate(argparse.Namespace(
+        interns=args.interns, tasks_per_intern=5, departments=8,
+        notifications=0, days=365, batch_size=1000, seed=42
+    ))
+    with Session(engine) as db:
+        intern_ids = [row.id for row in db.query(Intern.id).limit(100)]
+        task_ids = [row.id for row in db.query(Task.id).limit(100)]
+
+    uncompiled_engine = engine.execution_options(compiled_cache=None)
+    results = {}
+    for name, (keys, query, lookup) in cases(intern_ids, task_ids).items():
+        with Session(uncompiled_engine) as db:
+            uncompiled = per_call_us(db, query, keys, args.calls)
+        with Session(engine) as db:
+            # Warm the compiled cache, then measure
+            per_call_us(db, query, keys, 10)
+            per_call_us(db, lookup, keys, 10)
+            before = statement_cache_stats()
+            results[name] = {
+                "uncompiled_us": uncompiled,
+                "query_us": per_call_us(db, query, keys, args.calls),
+                "lookup_us": per_call_us(db, lookup, keys, args.calls)
+            }
+            after = statement_cache_stats()
+            held = lookup(db, keys[0])  # the identity map only holds weak references
+            results[name]["identity_us"] = per_call_us(db, lookup, keys[:1], args.calls, clear=False)
+            del held
+        results[name]["compiled_cache_hits"] = after["hit"] - before["hit"]
+        results[name]["compiled_cache_misses"] = after["miss"] - before["miss"]
+
+    stats = statement_cache_stats()
+    return {"calls": args.calls, "lookups": results, "hit_rate": stats["hit_rate"], "cached": stats["cached"]}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--interns", type=int, default=1000)
+    print(json.dumps(run(parser.parse_args()), indent=2))
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Read Path Benchmark
+
+Seeds a throwaway SQLite database (100k tasks and 100k notifications by
+default) and loads the same data the read-only endpoints do in three ways:
+ORM entities (identity map, relationship loading), ORM column queries, and
+the Core row tuples of app.repositories.reads. Reports median wall and CPU
+time per load and the peak Python memory allocated while loading.
+
+    python -m benchmarks.read_path --interns 10000 --tasks-per-intern 10 --notifications 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="ims-read-path-"), "read_path.db")
+
+# Settings are read at import time, so configure before importing the app
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{DATABASE_PATH}",
+    "PASSWORD_HASH_WORKERS": "0",
+    "BCRYPT_ROUNDS": "4",
+})
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import contains_eager
+from config.database import SessionLocal
+from app.models import Intern, Task, Notification
+from app.models.intern import InternStatus
+from app.repositories import reads
+from app.routes.interns import INTERN_FIELDS
+from benchmarks.generate_data import generate
+
+def intern_cases(count):
+    return {
+        "orm_entities": lambda db: db.query(Intern).all(),
+        "orm_columns": lambda db: db.query(*[getattr(Intern, field) for field in INTERN_FIELDS]).all(),
+        "core_rows": lambda db: reads.intern_page(db, INTERN_FIELDS, 0, count)[1],
+    }
+
+def active_task_cases():
+    # What top performers loads: every task of an active intern, with the
+    # intern's name and department
+    def orm_entities(db):
+        tasks = db.query(Task).join(Task.intern).options(contains_eager(Task.intern)).filter(
+            Intern.status == InternStatus.ACTIVE
+        ).order_by(Intern.id).all()
+        for task in tasks:
+            task.intern.full_name
+        return tasks
+
+    return {
+        "orm_entities": orm_entities,
+        "orm_columns": lambda db: db.query(
+            Intern.id, Intern.full_name, Intern.department, Task.status, Task.created_at, Task.updated_at
+        ).join(Task, Task.intern_id == Intern.id).filter(
+            Intern.status == InternStatus.ACTIVE
+        ).order_by(Intern.id).all(),
+        "core_rows": reads.active_intern_task_rows,
+    }
+
+def notification_cases(count):
+    return {
+        "orm_entities": lambda db: db.query(Notification).order_by(Notification.id.desc()).limit(count).all(),
+        "orm_columns": lambda db: db.query(
+            Notification.id, Notification.type, Notification.title, Notification.message,
+            Notification.created_at, Notification.priority
+        ).order_by(Notification.id.desc()).limit(count).all(),
+        "core_rows": lambda db: reads.notification_page(db, None, count),
+    }
+
+def measure(load, repeat):
+    wall, cpu = [], []
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            started, cpu_started = time.perf_counter(), time.process_time()
+            rows = load(db)
+            wall.append(time.perf_counter() - started)
+            cpu.append(time.process_time() - cpu_started)
+        finally:
+            db.close()
+
+    # Separate run for memory: tracemalloc slows allocation down
+    db = SessionLocal()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        rows = load(db)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        db.close()
+    return {
+        "rows": len(rows),
+        "wall_ms": round(statistics.median(wall) * 1000, 1),
+        "cpu_ms": round(statistics.median(cpu) * 1000, 1),
+        "peak_mb": round(peak / 1024 / 1024, 1)
+    }
+
+def run(args):
+    from bootstrap import bootstrap
+    bootstrap()
+    seeded = generate(argparse.Namespace(
+        interns=args.interns, tasks_per_intern=args.tasks_per_intern, departments=8,
+        notifications=args.notifications, days=365, batch_size=1000, seed=42
+    ))
+
+    cases = {
+        "intern_directory": intern_cases(args.interns),
+        "active_intern_tasks": active_task_cases(),
+        "notifications": notification_cases(args.notifications),
+    }
+    results = {}
+    for name, variants in cases.items():
+        results[name] = {variant: measure(load, args.repeat) for variant, load in variants.items()}
+        orm, core = results[name]["orm_entities"], results[name]["core_rows"]
+        results[name]["core_speedup"] = round(orm["cpu_ms"] / core["cpu_ms"], 1) if core["cpu_ms"] else None
+        results[name]["core_memory_ratio"] = round(orm["peak_mb"] / core["peak_mb"], 1) if core["peak_mb"] else None
+    return {"seeded": {key: seeded[key] for key in ("interns", "tasks", "notifications")}, "cases": results}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interns", type=int, default=10000)
+    parser.add_argument("--tasks-per-intern", type=int, default=10)
+    parser.add_argument("--notifications", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    print(json.dumps(run(parser.parse_args()), indent=2))
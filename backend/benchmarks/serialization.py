@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Serialization Microbenchmark
+
+Measures per-response CPU cost of turning a 100-intern page and an
+analytics payload into bytes, comparing the model path (build Pydantic
+objects, let FastAPI validate them against response_model and dump with
+json) with the dict path (plain dicts rendered by orjson). No database or
+server is involved.
+
+    python -m benchmarks.serialization --rows 100 --repeat 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models.intern import Intern, InternStatus
+from app.routes.analytics import AnalyticsData
+from app.routes.interns import InternResponse, InternsListResponse, TaskStats, intern_dict
+from app.utils.responses import json_response
+
+def sample_interns(rows):
+    joined = datetime(2024, 1, 1, 9, 30)
+    return [
+        Intern(
+            id=i, full_name=f"Intern {i}", email=f"intern{i}@example.com", phone="5550000000",
+            department=f"Department {i % 8}", position="Backend Intern", university="State University",
+            skills=json.dumps(["Python", "SQL", "React"]), join_date=joined + timedelta(hours=i),
+            status=InternStatus.ACTIVE
+        )
+        for i in range(1, rows + 1)
+    ]
+
+def sample_stats(rows):
+    return {
+        i: {"total_tasks": 10, "completed_tasks": 6, "pending_tasks": 3, "overdue_tasks": 1, "completion_rate": 60.0}
+        for i in range(1, rows + 1)
+    }
+
+def sample_analytics():
+    return {
+        "totalInterns": 1000, "activeInterns": 800, "inactiveInterns": 200,
+        "completedTasks": 6000, "pendingTasks": 3000, "overdueTasks": 1000,
+        "departmentStats": [{"name": f"Department {i}", "value": 100 + i, "color": "#3b82f6"} for i in range(12)],
+        "monthlyGrowth": [{"month": f"Month {i}", "interns": 50 + i, "tasks": 500 + i} for i in range(6)],
+        "performanceMetrics": [{"department": f"Department {i}", "completion": 61.5, "efficiency": 42.0} for i in range(12)],
+        "recentActivity": [{"date": f"2024-01-0{i + 1}", "active": 10, "joined": 2, "completed": 30} for i in range(7)]
+    }
+
+def model_interns_page(interns, stats):
+    # What the handlers did before: a model per row, then FastAPI validation
+    page = []
+    for intern in interns:
+        page.append(InternResponse(
+            id=intern.id, full_name=intern.full_name, email=intern.email, phone=intern.phone,
+            department=intern.department, position=intern.position, university=intern.university,
+            skills=json.loads(intern.skills), join_date=intern.join_date, status=intern.status,
+            task_stats=TaskStats(**stats[intern.id])
+        ))
+    return InternsListResponse(interns=page, total=len(page))
+
+async def model_render(field, content):
+    encoded = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return JSONResponse(encoded).body
+
+def timed(repeat, func):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def run(args):
+    interns, stats = sample_interns(args.rows), sample_stats(args.rows)
+    analytics = sample_analytics()
+    page_field = create_response_field(name="Response", type_=InternsListResponse)
+    analytics_field = create_response_field(name="Response", type_=AnalyticsData)
+    loop = asyncio.new_event_loop()
+
+    results = {}
+    results["interns_page_model_us"] = timed(args.repeat, lambda: loop.run_until_complete(
+        model_render(page_field, model_interns_page(interns, stats))
+    ))
+    results["interns_page_dict_us"] = timed(args.repeat, lambda: json_response(
+        {"interns": [intern_dict(intern, stats[intern.id]) for intern in interns], "total": len(interns)}
+    ).body)
+    results["analytics_model_us"] = timed(args.repeat, lambda: loop.run_until_complete(
+        model_render(analytics_field, AnalyticsData(**analytics))
+    ))
+    results["analytics_dict_us"] = timed(args.repeat, lambda: json_response(analytics).body)
+    loop.close()
+
+    report = {key: round(value, 1) for key, value in results.items()}
+    report["interns_page_speedup"] = round(results["interns_page_model_us"] / results["interns_page_dict_us"], 1)
+    report["analytics_speedup"] = round(results["analytics_model_us"] / results["analytics_dict_us"], 1)
+    report["rows"] = args.rows
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    print(json.dumps(run(parser.parse_args()), indent=2))
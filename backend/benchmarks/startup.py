@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+
+Measures, in fresh interpreters, how long `import app.main` takes and how
+long the lifespan startup takes until /health answers. Also lists the
+slowest imports from `python -X importtime`.
+
+    python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import time
+from starlette.testclient import TestClient
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+with TestClient(app.main.app) as client:
+    ready = time.perf_counter()
+    assert client.get("/health").status_code == 200
+print(imported - started, ready - imported)
+"""
+
+def timed_runs(runs):
+    imports, startups = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.split()
+        imports.append(float(output[-2]))
+        startups.append(float(output[-1]))
+    return imports, startups
+
+def slowest_imports(limit):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in rows[:limit]]
+
+def summary(values):
+    return {
+        "p50_ms": round(percentile(values, 50) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    imports, startups = timed_runs(args.runs)
+    print(json.dumps({
+        "runs": args.runs,
+        "import_app": summary(imports),
+        "lifespan_startup": summary(startups),
+        "slowest_imports": slowest_imports(args.top)
+    }, indent=2))
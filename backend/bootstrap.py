@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Bootstrap Script
+
+One-shot deploy step: creates missing tables and indexes, then the default
+admin user. Run it once per deploy (before starting gunicorn) instead of in
+every worker at import time.
+
+    python bootstrap.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def bootstrap():
+    """Create schema and default admin user"""
+    from config.database import engine, Base
+    import app.models  # noqa: F401 - registers every table on Base.metadata
+    from app.models import Task
+    from app.utils.notification_retention import ensure_notification_indexes
+    from app.utils.reports import ensure_report_indexes
+    from create_admin import create_admin_user
+
+    Base.metadata.create_all(bind=engine)
+    ensure_notification_indexes(engine)
+    ensure_report_indexes(engine)
+    # Task indexes added after the table may already exist
+    for index in Task.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    print("Database schema is up to date")
+
+    create_admin_user()
+
+if __name__ == "__main__":
+    bootstrap()
@@ -1,9 +1,13 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import os
+import tempfile
+import threading
+import time
 
 load_dotenv()
 
@@ -13,37 +17,295 @@ class Settings(BaseSettings):
     algorithm: str = os.getenv("ALGORITHM", "HS256")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-settings = Settings()
+    # Run bootstrap.py from each worker's startup instead of as a deploy step
+    auto_bootstrap: bool = os.getenv("AUTO_BOOTSTRAP", "false").lower() == "true"
 
-# Database engine configuration
-if settings.database_url.startswith("postgresql"):
-    # PostgreSQL for production (Render)
-    engine = create_engine(
-        settings.database_url,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        echo=False
+    # Connection pooling. Each gunicorn worker has its own pool, so by default
+    # DB_MAX_CONNECTIONS is divided across WEB_CONCURRENCY workers (pool plus
+    # overflow); DB_POOL_SIZE > 0 sets the per-worker size directly. A
+    # worker runs no more sync handlers at once than its pool has
+    # connections (see worker_threads), so checkouts don't time out.
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY", "4"))
+    db_max_connections: int = int(os.getenv("DB_MAX_CONNECTIONS", "40"))
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "0"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+
+    # Optional read replica for read-only handlers. After a client writes,
+    # its reads stay on the primary for READ_YOUR_WRITES_SECONDS.
+    read_database_url: str = os.getenv("READ_DATABASE_URL", "")
+    read_your_writes_seconds: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+    # SQLite connection pragmas
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    sqlite_cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+
+    # Notification retention: read notifications older than their TTL are
+    # deleted (or archived) in small batches. Per-type/priority overrides use
+    # "type:task_assigned=14,priority:high=90"; a TTL of 0 keeps rows forever.
+    notification_retention_days: int = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "30"))
+    notification_retention_ttls: str = os.getenv("NOTIFICATION_RETENTION_TTLS", "")
+    notification_retention_mode: str = os.getenv("NOTIFICATION_RETENTION_MODE", "delete")  # 'delete' or 'archive'
+    notification_retention_batch_size: int = int(os.getenv("NOTIFICATION_RETENTION_BATCH_SIZE", "500"))
+
+    # Intern archival (archive_interns.py): INACTIVE interns not updated for
+    # ARCHIVE_INACTIVE_DAYS move, with their tasks, to the archive tables in
+    # batches; reads include them only with include_archived=true
+    archive_inactive_days: int = int(os.getenv("ARCHIVE_INACTIVE_DAYS", "365"))
+    archive_batch_size: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "200"))
+
+    # Per-worker cache of authenticated users (0 disables)
+    principal_cache_ttl_seconds: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    principal_cache_size: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+
+    # Password hashing runs in a dedicated process pool (0 workers = threads)
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    password_hash_concurrency: int = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "2"))
+    password_hash_max_queue: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+    # Login rate limiting: token buckets per client IP and per username.
+    # Empty storage URL keeps buckets in process; any SQLAlchemy URL (e.g. a
+    # local sqlite file, or the main database) shares them across workers.
+    login_rate_limit_ip_burst: int = int(os.getenv("LOGIN_RATE_LIMIT_IP_BURST", "20"))
+    login_rate_limit_ip_per_minute: float = float(os.getenv("LOGIN_RATE_LIMIT_IP_PER_MINUTE", "10"))
+    login_rate_limit_user_burst: int = int(os.getenv("LOGIN_RATE_LIMIT_USER_BURST", "5"))
+    login_rate_limit_user_per_minute: float = float(os.getenv("LOGIN_RATE_LIMIT_USER_PER_MINUTE", "5"))
+    rate_limit_storage_url: str = os.getenv("RATE_LIMIT_STORAGE_URL", "")
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+    # Behind proxies the client is the X-Forwarded-For entry the outermost
+    # of RATE_LIMIT_TRUSTED_PROXIES appended; entries left of it are
+    # client-supplied and never used
+    rate_limit_trust_forwarded_for: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "false").lower() == "true"
+    rate_limit_trusted_proxies: int = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+
+    # Avatar uploads: content-addressed files plus thumbnails built in a pool
+    upload_dir: str = os.getenv("UPLOAD_DIR", "uploads")
+    avatar_max_bytes: int = int(os.getenv("AVATAR_MAX_BYTES", str(2 * 1024 * 1024)))
+    avatar_thumbnail_sizes: str = os.getenv("AVATAR_THUMBNAIL_SIZES", "64,256")
+    avatar_thumbnail_workers: int = int(os.getenv("AVATAR_THUMBNAIL_WORKERS", "2"))
+
+    # Statements slower than this are logged with normalized SQL (0 disables)
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+    # Query budgets declared with @query_budget: 'warn' logs and counts
+    # violations, 'raise' fails the request (for budget checks), 'off'.
+    # The same statement running more than QUERY_REPEAT_THRESHOLD times in
+    # one request is flagged as a likely N+1.
+    query_budget_mode: str = os.getenv("QUERY_BUDGET_MODE", "warn")
+    query_repeat_threshold: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+
+    # Sampling profiler: admins opt in per request with X-Profile: 1; a
+    # sample rate > 0 also profiles that fraction of all requests. Reports
+    # are collapsed stacks, the oldest dropped past PROFILE_MAX_FILES.
+    profile_sample_rate: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    profile_interval_ms: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    profile_dir: str = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "ims-profiles"))
+    profile_max_files: int = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+    # Response compression: allowlisted types of at least MIN_SIZE bytes are
+    # gzipped (brotli when installed and accepted); 0 min size compresses all
+    compression_enabled: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    compression_min_size: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    compression_gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    compression_brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    compression_types: str = os.getenv(
+        "COMPRESSION_TYPES",
+        "application/json,text/plain,text/csv,text/html,text/css,application/javascript"
     )
-    print("Connected to PostgreSQL database")
-elif settings.database_url.startswith("mysql"):
-    # MySQL configuration
-    engine = create_engine(
-        settings.database_url,
+
+    # Admission control: sync handlers and dependencies share THREADPOOL_SIZE
+    # threads per worker (fewer if the connection pool is smaller, with the
+    # slot counts below scaled to match). Heavy routes (analytics, dashboard aggregates) and
+    # everything else get separate slot counts, which should leave a few
+    # threads free; light routes (health, metrics) are never limited.
+    # Requests still queued after ADMISSION_QUEUE_TIMEOUT_MS, or arriving to
+    # ADMISSION_MAX_QUEUE waiters (0 = unbounded), get a 503 with Retry-After.
+    threadpool_size: int = int(os.getenv("THREADPOOL_SIZE", "40"))
+    admission_control_enabled: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    admission_heavy_limit: int = int(os.getenv("ADMISSION_HEAVY_LIMIT", "4"))
+    admission_default_limit: int = int(os.getenv("ADMISSION_DEFAULT_LIMIT", "32"))
+    admission_queue_timeout_ms: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "2000"))
+    admission_max_queue: int = int(os.getenv("ADMISSION_MAX_QUEUE", "100"))
+    admission_retry_after: int = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+    # POST /api/batch: most GET sub-requests per batch, and how many run
+    # concurrently (each concurrent lane holds its own read session)
+    batch_max_requests: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    batch_lanes: int = int(os.getenv("BATCH_LANES", "2"))
+
+    # Report jobs: each worker computes queued reports in REPORT_WORKERS
+    # processes (0 runs them inline, for development) and writes artifacts
+    # to REPORT_DIR. Jobs not finished within the timeout are replaced.
+    report_workers: int = int(os.getenv("REPORT_WORKERS", "1"))
+    report_dir: str = os.getenv("REPORT_DIR", "reports")
+    report_job_timeout_seconds: int = int(os.getenv("REPORT_JOB_TIMEOUT_SECONDS", "600"))
+
+    # GET /api/changes holds back change log entries younger than this, so a
+    # slow transaction that commits after a later one isn't skipped
+    change_feed_settle_ms: int = int(os.getenv("CHANGE_FEED_SETTLE_MS", "1000"))
+
+    # Compiled statements each engine keeps per worker (SQLAlchemy's
+    # query_cache_size); raise it if db_statement_cache_total shows misses
+    # after warm-up
+    sql_compiled_cache_size: int = int(os.getenv("SQL_COMPILED_CACHE_SIZE", "500"))
+
+    # Optional per-worker in-memory copy of the intern directory (id, name,
+    # email, department, status, skills), refreshed from the change log every
+    # INTERN_MIRROR_REFRESH_MS; reads use the database once it is more than
+    # INTERN_MIRROR_MAX_STALENESS_MS behind
+    intern_mirror_enabled: bool = os.getenv("INTERN_MIRROR_ENABLED", "false").lower() == "true"
+    intern_mirror_refresh_ms: int = int(os.getenv("INTERN_MIRROR_REFRESH_MS", "1000"))
+    intern_mirror_max_staleness_ms: int = int(os.getenv("INTERN_MIRROR_MAX_STALENESS_MS", "5000"))
+
+    # Directory of signal files shared by the gunicorn workers on one host
+    worker_signal_dir: str = os.getenv("WORKER_SIGNAL_DIR", os.path.join(tempfile.gettempdir(), "ims-signals"))
+
+settings = Settings()
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long request threads wait for a connection"""
+
+    # Callables taking (waited_seconds, timed_out), e.g. metrics exporters
+    wait_observers = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Checkouts come from many request threads at once
+        self._meter_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._meter_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+            for observer in self.wait_observers:
+                observer(waited, timed_out)
+
+    def recreate(self):
+        # Keep metering across dispose()
+        pool = super().recreate()
+        pool.checkouts, pool.timeouts = self.checkouts, self.timeouts
+        pool.total_wait, pool.max_wait = self.total_wait, self.max_wait
+        return pool
+
+def pool_sizing():
+    """Per-worker (pool_size, max_overflow) from the connection budget.
+
+    Every gunicorn worker gets its own pool, so the budget is split across
+    WEB_CONCURRENCY workers unless DB_POOL_SIZE pins the size explicitly.
+    """
+    if settings.db_pool_size > 0:
+        return settings.db_pool_size, settings.db_max_overflow
+    # No more than the worker's threads could ever check out at once
+    per_worker = max(1, min(
+        settings.db_max_connections // max(1, settings.web_concurrency), settings.threadpool_size
+    ))
+    max_overflow = min(settings.db_max_overflow, per_worker - 1)
+    return per_worker - max_overflow, max_overflow
+
+def worker_threads() -> int:
+    """Threadpool size for one worker: THREADPOOL_SIZE, capped at the
+    connections its pool can hand out. Nearly every sync handler holds a
+    connection, so extra threads would only wait in the pool and time out;
+    capped, the excess requests queue (and are shed) in admission control.
+    """
+    pool_size, max_overflow = pool_sizing()
+    return max(1, min(settings.threadpool_size, pool_size + max_overflow))
+
+def pool_stats(bind=None) -> dict:
+    pool = (bind or engine).pool
+    stats = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "idle": pool.checkedin(),
+            "timeout_seconds": pool.timeout()
+        })
+    if isinstance(pool, MeteredQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "avg_wait_ms": round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "max_wait_ms": round(pool.max_wait * 1000, 3)
+        })
+    return stats
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed during a write, and busy_timeout makes writers
+    # wait for the lock instead of failing with "database is locked"
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    cursor.close()
+
+def build_engine(url: str):
+    if url.startswith("sqlite"):
+        # SQLite for development
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            return create_engine(
+                url, connect_args={"check_same_thread": False},
+                query_cache_size=settings.sql_compiled_cache_size, echo=False
+            )
+        pool_size, max_overflow = pool_sizing()
+        sqlite_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=MeteredQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            query_cache_size=settings.sql_compiled_cache_size,
+            echo=False
+        )
+        event.listen(sqlite_engine, "connect", _set_sqlite_pragmas)
+        return sqlite_engine
+
+    # PostgreSQL for production (Render) and MySQL
+    pool_size, max_overflow = pool_sizing()
+    return create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout,
         pool_pre_ping=True,
-        pool_recycle=300,
-        echo=False
-    )
-    print("Connected to MySQL database")
-else:
-    # SQLite for development
-    engine = create_engine(
-        settings.database_url,
-        connect_args={"check_same_thread": False},
+        pool_recycle=settings.db_pool_recycle,
+        query_cache_size=settings.sql_compiled_cache_size,
         echo=False
     )
-    print("Connected to SQLite database")
+
+# Database engine configuration (no connection is opened until first use)
+engine = build_engine(settings.database_url)
+
+# Read replica (falls back to the primary when not configured)
+read_engine = build_engine(settings.read_database_url) if settings.read_database_url else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 def get_db():
@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration
+
+The app is imported once in the master (preload_app) and workers fork from
+it, sharing the loaded code and module state copy-on-write instead of each
+importing everything again. Schema/admin setup is not part of startup; run
+bootstrap.py once per deploy.
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Workers write Prometheus samples here so /metrics can aggregate them. Set
+# and emptied here because the preloaded app imports prometheus_client before
+# any server hook runs; samples from a previous run would otherwise be summed in.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "ims-metrics"))
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+def pre_fork(server, worker):
+    # Move everything loaded so far out of the collector's reach, so GC runs
+    # in workers don't touch (and un-share) the master's pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    # Never share pooled connections opened in the master with a worker
+    from config.database import engine, read_engine
+    engine.dispose(close=False)
+    if read_engine is not engine:
+        read_engine.dispose(close=False)
+
+def child_exit(server, worker):
+    from app.utils.metrics import mark_worker_dead
+    mark_worker_dead(worker.pid)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Notification Retention Script
+
+Deletes (or archives, with NOTIFICATION_RETENTION_MODE=archive) read
+notifications older than their configured TTL. Safe to run from cron.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import SessionLocal, engine, Base
+from app.models import NotificationArchive
+from app.utils.notification_retention import purge_read_notifications, ensure_notification_indexes
+
+def run_retention():
+    """Apply notification retention rules"""
+    Base.metadata.create_all(bind=engine, tables=[NotificationArchive.__table__])
+    ensure_notification_indexes(engine)
+
+    db = SessionLocal()
+    try:
+        removed = purge_read_notifications(db)
+    finally:
+        db.close()
+
+    for label, count in removed.items():
+        print(f"{label}: {count} notifications removed")
+    print(f"Total: {sum(removed.values())} notifications removed")
+
+if __name__ == "__main__":
+    run_retention()
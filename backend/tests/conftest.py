@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway SQLite
+# database before any test imports it
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='ims-tests-'), 'tests.db')}",
+    "PASSWORD_HASH_WORKERS": "0",
+    "BCRYPT_ROUNDS": "4",
+})
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
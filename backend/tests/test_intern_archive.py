@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+import pytest
+from config.database import Base, SessionLocal, engine
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.models.intern import Intern, InternStatus
+from app.models.task import Task, TaskStatus
+from app.repositories import reads
+from app.utils.intern_archive import archive_inactive_interns, restore_interns
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def add_intern(db, email, **values):
+    intern = Intern(full_name=email, email=email, phone="1", department="QA", **values)
+    db.add(intern)
+    db.commit()
+    return intern
+
+def test_archiving_the_newest_intern_does_not_free_its_id(db):
+    stale = datetime.utcnow() - timedelta(days=365)
+    archived = add_intern(db, "old@example.com", status=InternStatus.INACTIVE, updated_at=stale)
+    db.add(Task(intern_id=archived.id, title="t", deadline=stale, status=TaskStatus.PENDING))
+    db.commit()
+    archived_id = archived.id
+
+    assert archive_inactive_interns(db, days=30) == {"interns": 1, "tasks": 1}
+    new = add_intern(db, "new@example.com")
+
+    assert new.id > archived_id
+    counts = reads.task_counts_by_intern(db, [new.id, archived_id], include_archived=True)
+    assert new.id not in counts
+    assert counts[archived_id] == (1, 0, 1, 0)
+    assert restore_interns(db, [archived_id]) == 1
+    assert reads.task_counts_by_intern(db, [archived_id]) == {archived_id: (1, 0, 1, 0)}